@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _log_to_tmp(tmp_path_factory):
+    # get_logger() appends to data/sim.log under the cwd; keep test runs out of the tree
+    from sim.core import logging as sim_logging
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(sim_logging, "LOG_PATH", str(tmp_path_factory.mktemp("logs") / "sim.log"))
+        yield
@@ -4,9 +4,6 @@ import argparse
 import json
 import sys
 
-from sim.app.runner import run
-from sim.features.run_explorer.service import RunExplorerService
-
 
 def _print_table(rows: list[dict], cols: list[str]) -> None:
     if not rows:
@@ -22,8 +19,20 @@ def _print_table(rows: list[dict], cols: list[str]) -> None:
         print("  ".join(str(r.get(c, "")).ljust(widths[c]) for c in cols))
 
 
+def _version() -> str:
+    # importlib.metadata is only needed here; keep it off the `--help` import path
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("marketing-sim")
+    except PackageNotFoundError:  # running from a source checkout without install
+        return "unknown"
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(prog="marketing-sim")
+    # argparse prints and exits 0 here, before any subcommand (or the runner) is imported
+    parser.add_argument("--version", action="version", version=f"%(prog)s {_version()}")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     # ---- run ----
@@ -44,12 +53,18 @@ def main(argv: list[str] | None = None) -> int:
 
     args = parser.parse_args(argv)
 
+    # Heavy imports (simpy, duckdb, yaml, numpy) are deferred so `--help` and
+    # argument errors return without loading the simulation stack.
     if args.cmd == "run":
+        from sim.app.runner import run
+
         result = run(args.config)
         print(f"run_id={result.ctx.run_id} duckdb={result.duckdb_path}")
         return 0
 
     if args.cmd == "inspect":
+        from sim.features.run_explorer.service import RunExplorerService
+
         ex = RunExplorerService(duckdb_path=args.db)
 
         if args.what == "runs":
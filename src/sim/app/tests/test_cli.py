@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[3]
+
+
+def test_version_exits_zero_without_loading_the_runner() -> None:
+    code = (
+        "import sys\n"
+        "from sim.app.cli import main\n"
+        "try:\n"
+        "    main(['--version'])\n"
+        "except SystemExit as e:\n"
+        "    assert e.code == 0, e.code\n"
+        "else:\n"
+        "    raise AssertionError('--version did not exit')\n"
+        "assert 'sim.app.runner' not in sys.modules\n"
+        "assert 'simpy' not in sys.modules and 'duckdb' not in sys.modules\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(SRC)},
+        check=False,
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.startswith("marketing-sim ")
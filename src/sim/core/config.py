@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import mmap
+from contextlib import closing
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+# libyaml-backed loader when PyYAML was built with it; same safe semantics.
+_YamlSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class RunConfig:
     run_id: str
     seed: int
@@ -15,25 +20,45 @@ class RunConfig:
     num_days: int
 
 
-@dataclass(frozen=True)
+# DuckDB ingest cost is dominated by per-batch overhead: throughput climbs steeply up to
+# ~10k rows per batch and keeps improving toward 100k. Tiny batches are rejected.
+DEFAULT_FLUSH_EVERY_N_EVENTS = 10_000
+MIN_FLUSH_EVERY_N_EVENTS = 100
+
+
+@dataclass(frozen=True, slots=True)
 class FlushConfig:
-    every_n_events: int = 5000
+    every_n_events: int = DEFAULT_FLUSH_EVERY_N_EVENTS  # 0 disables count-based flushing
     or_every_seconds: float = 30.0
+    background: bool = False  # write batches on a writer thread instead of inline
+    min_interval_s: float = 0.0  # defer count flushes closer together than this (wall clock)
+
+
+@dataclass(frozen=True, slots=True)
+class DuckDBTuningConfig:
+    """Connection settings applied on open; None keeps DuckDB's own default."""
+
+    threads: int | None = None
+    memory_limit: str | None = None  # e.g. "2GB"
+    checkpoint_threshold: str | None = None  # e.g. "1GB": fewer WAL checkpoints mid-run
+    temp_directory: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StorageConfig:
     duckdb_path: str
     clean_slate: bool = True
     flush: FlushConfig = field(default_factory=FlushConfig)
+    duckdb: DuckDBTuningConfig = field(default_factory=DuckDBTuningConfig)
+    event_type_enum: bool = False  # store events.event_type as an ENUM of the known types
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LoggingConfig:
     level: str = "INFO"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SimulationConfig:
     run: RunConfig
     storage: StorageConfig
@@ -43,7 +68,15 @@ class SimulationConfig:
 
 def load_yaml(path: str | Path) -> dict[str, Any]:
     p = Path(path)
-    data = yaml.safe_load(p.read_text())
+    with p.open("rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # empty files and non-mappable streams (pipes, some special files)
+            data = yaml.load(f.read(), Loader=_YamlSafeLoader)
+        else:
+            with closing(mm):
+                data = yaml.load(mm, Loader=_YamlSafeLoader)
     if not isinstance(data, dict):
         raise ValueError("Config YAML must parse to a dict at the top level.")
     return data
@@ -68,16 +101,40 @@ def parse_config(data: dict[str, Any]) -> SimulationConfig:
     )
 
     # --- storage.flush (THIS WAS MISSING) ---
+    # slotted dataclasses have no class-level defaults, so read them off an instance
     flush_raw = storage.get("flush") or {}
+    flush_defaults = FlushConfig()
+    every_n_raw = flush_raw.get("every_n_events")
+    every_n = flush_defaults.every_n_events if every_n_raw is None else int(every_n_raw)
+    if every_n < 0 or 0 < every_n < MIN_FLUSH_EVERY_N_EVENTS:
+        raise ValueError(
+            f"storage.flush.every_n_events must be 0 (disabled) or >= {MIN_FLUSH_EVERY_N_EVENTS}"
+        )
     flush_cfg = FlushConfig(
-        every_n_events=int(flush_raw.get("every_n_events", FlushConfig.every_n_events)),
-        or_every_seconds=float(flush_raw.get("or_every_seconds", FlushConfig.or_every_seconds)),
+        every_n_events=every_n,
+        or_every_seconds=float(flush_raw.get("or_every_seconds", flush_defaults.or_every_seconds)),
+        background=bool(flush_raw.get("background", flush_defaults.background)),
+        min_interval_s=float(flush_raw.get("min_interval_s", flush_defaults.min_interval_s)),
     )
 
+    # --- storage.duckdb ---
+    duckdb_raw = storage.get("duckdb") or {}
+    threads_raw = duckdb_raw.get("threads")
+    duckdb_cfg = DuckDBTuningConfig(
+        threads=None if threads_raw is None else int(threads_raw),
+        memory_limit=_opt_str(duckdb_raw.get("memory_limit")),
+        checkpoint_threshold=_opt_str(duckdb_raw.get("checkpoint_threshold")),
+        temp_directory=_opt_str(duckdb_raw.get("temp_directory")),
+    )
+    if duckdb_cfg.threads is not None and duckdb_cfg.threads < 1:
+        raise ValueError("storage.duckdb.threads must be >= 1")
+
     storage_cfg = StorageConfig(
         duckdb_path=str(storage["duckdb_path"]),
         clean_slate=bool(storage.get("clean_slate", True)),
         flush=flush_cfg,
+        event_type_enum=bool(storage.get("event_type_enum", False)),
+        duckdb=duckdb_cfg,
     )
 
     # --- logging ---
@@ -86,6 +143,25 @@ def parse_config(data: dict[str, Any]) -> SimulationConfig:
     return SimulationConfig(run=run_cfg, storage=storage_cfg, logging=log_cfg, raw=data)
 
 
+def _opt_str(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+# resolved path -> (mtime_ns, size, parsed config); a changed file replaces its entry.
+_CFG_CACHE: dict[str, tuple[int, int, SimulationConfig]] = {}
+
+
 def load_config(path: str | Path) -> SimulationConfig:
-    data = load_yaml(path)
-    return parse_config(data)
+    """
+    Load and parse a config file, reusing the parsed result while the file is unchanged.
+    The cached SimulationConfig (including .raw) is shared; treat it as read-only.
+    """
+    p = Path(path).resolve()
+    st = p.stat()
+    cached = _CFG_CACHE.get(str(p))
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+
+    cfg = parse_config(load_yaml(p))
+    _CFG_CACHE[str(p)] = (st.st_mtime_ns, st.st_size, cfg)
+    return cfg
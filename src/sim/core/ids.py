@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import hashlib
 import json
+from collections import defaultdict
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
 
@@ -16,18 +18,48 @@ def deterministic_run_id_from_config(cfg_raw: dict[str, Any], length: int = 12)
     Deterministic run_id derived from the full config content.
     - If you run twice with the same YAML content, you get the same run_id.
     - If config changes, run_id changes.
+    Uses BLAKE2b sized to the requested length; this is an identifier, not a security hash.
     """
-    s = canonical_json(cfg_raw).encode("utf-8")
-    h = hashlib.sha1(s).hexdigest()
-    return h[:length]
+    return _short_hash(canonical_json(cfg_raw).encode("utf-8"), length)
+
+
+def deterministic_run_id_from_file(path: str | Path, length: int = 12) -> str:
+    """
+    Deterministic run_id derived from the raw bytes of a config file.
+    Skips re-serializing the parsed config; any byte change (including comments) changes it.
+    """
+    return _short_hash(Path(path).read_bytes(), length)
+
+
+def _short_hash(data: bytes, length: int) -> str:
+    digest_size = min(64, max(1, (length + 1) // 2))
+    return hashlib.blake2b(data, digest_size=digest_size).hexdigest()[:length]
 
 
 @dataclass(slots=True)
 class IdsService:
     run_id: str
-    _counters: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _counters: defaultdict[str, int] = field(
+        default_factory=lambda: defaultdict(int), init=False, repr=False
+    )
+    _templates: dict[str, str] = field(default_factory=dict, init=False, repr=False)
 
     def next_id(self, prefix: str) -> str:
-        n = self._counters.get(prefix, 0) + 1
-        self._counters[prefix] = n
-        return f"{prefix}_{self.run_id}_{n:08d}"
+        counters = self._counters
+        counters[prefix] += 1
+        tpl = self._templates.get(prefix)
+        if tpl is None:
+            tpl = self._templates.setdefault(prefix, f"{prefix}_{self.run_id}_")
+        return tpl + str(counters[prefix]).zfill(8)
+
+    def next_ids(self, prefix: str, k: int) -> list[str]:
+        """Allocate k consecutive ids for prefix in one counter bump."""
+        if k <= 0:
+            return []
+        counters = self._counters
+        start = counters[prefix] + 1
+        counters[prefix] = start + k - 1
+        tpl = self._templates.get(prefix)
+        if tpl is None:
+            tpl = self._templates.setdefault(prefix, f"{prefix}_{self.run_id}_")
+        return [tpl + str(n).zfill(8) for n in range(start, start + k)]
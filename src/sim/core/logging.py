@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import json
 import logging
-from datetime import UTC, datetime
+import time
 from typing import Any
 
+# File every get_logger() handler appends to, relative to the working directory.
+# Tests point it at a temp dir (src/conftest.py) so runs don't dirty the tree.
+LOG_PATH = "data/sim.log"
+
 # Standard LogRecord attributes we don't want to re-emit as "extras"
 _RESERVED = {
     "name",
@@ -31,9 +35,23 @@ _RESERVED = {
 
 
 class JsonFormatter(logging.Formatter):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # "YYYY-MM-DDTHH:MM:SS" for the last whole second seen; records arrive in bursts
+        self._ts_sec: int | None = None
+        self._ts_prefix = ""
+
+    def _format_ts(self, created: float) -> str:
+        # Uses the timestamp logging already captured instead of reading the clock again.
+        sec = int(created)
+        if sec != self._ts_sec:
+            self._ts_sec = sec
+            self._ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        return f"{self._ts_prefix}.{int((created - sec) * 1e6):06d}+00:00"
+
     def format(self, record: logging.LogRecord) -> str:
         payload: dict[str, Any] = {
-            "ts_utc": datetime.now(UTC).isoformat(),
+            "ts_utc": self._format_ts(record.created),
             "level": record.levelname,
             "logger": record.name,
             "msg": record.getMessage(),
@@ -53,6 +71,28 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(payload, separators=(",", ":"), ensure_ascii=True)
 
 
+class JsonBytesFileHandler(logging.FileHandler):
+    """
+    Appends JSON lines in binary mode: the formatted line is encoded once and
+    written as bytes, skipping the text-mode stream wrapper.
+    """
+
+    def __init__(self, filename: str, delay: bool = False) -> None:
+        super().__init__(filename, mode="ab", delay=delay)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record) + "\n"
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(line.encode("utf-8"))
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
 def get_logger(name: str, level: str = "INFO") -> logging.Logger:
     logger = logging.getLogger(name)
     if logger.handlers:
@@ -60,7 +100,7 @@ def get_logger(name: str, level: str = "INFO") -> logging.Logger:
 
     logger.setLevel(level.upper())
 
-    handler = logging.FileHandler("data/sim.log")
+    handler = JsonBytesFileHandler(LOG_PATH)
     handler.setFormatter(JsonFormatter())
 
     logger.addHandler(handler)
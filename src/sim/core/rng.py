@@ -1,11 +1,9 @@
 from __future__ import annotations
 
 import random
-from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import TypeVar
 
-T = TypeVar("T")
+import numpy as np
 
 
 @dataclass
@@ -14,23 +12,18 @@ class RNG:
 
     def __post_init__(self) -> None:
         self._r = random.Random(self.seed)
-
-    def random(self) -> float:
-        return self._r.random()
-
-    def randint(self, a: int, b: int) -> int:
-        return self._r.randint(a, b)
-
-    def choice(self, seq: Sequence[T]) -> T:
-        return self._r.choice(seq)
-
-    def choices(
-        self,
-        population: Sequence[T],
-        weights: Sequence[float] | None = None,
-        k: int = 1,
-    ) -> list[T]:
-        return self._r.choices(population, weights=weights, k=k)
-
-    def expovariate(self, lambd: float) -> float:
-        return self._r.expovariate(lambd)
+        self._np = np.random.default_rng(self.seed)
+        # Bind the underlying methods directly so each draw skips a wrapper call.
+        self.random = self._r.random
+        self.randint = self._r.randint
+        self.randrange = self._r.randrange
+        self.choice = self._r.choice
+        self.choices = self._r.choices
+        self.expovariate = self._r.expovariate
+
+    def numpy_generator(self) -> np.random.Generator:
+        """
+        NumPy generator seeded from the same seed, for batch draws.
+        Its stream is independent of the scalar draws bound above.
+        """
+        return self._np
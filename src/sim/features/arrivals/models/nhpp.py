@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-import math
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
+
+import numpy as np
 
 from sim.core.ids import IdsService
 from sim.core.rng import RNG
@@ -15,14 +17,14 @@ from sim.features.site_graph.service import WebsiteGraph  # adjust path to your
 SECONDS_PER_DAY = 24 * 60 * 60
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GaussianPeakCurveConfig:
     peak_hour: float
     spread_hours: float
     floor: float = 0.05
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NHPPBaselineArrivalsConfig:
     """
     NHPP baseline arrivals config (distribution-specific).
@@ -36,50 +38,74 @@ class NHPPBaselineArrivalsConfig:
 
 
 def _assert_utc(dt: datetime) -> datetime:
+    # datetime.UTC is a singleton: the common already-UTC case returns without a call
+    if dt.tzinfo is UTC:
+        return dt
     if dt.tzinfo is None:
         return dt.replace(tzinfo=UTC)
     return dt.astimezone(UTC)
 
 
-def _gaussian_shape(hour: float, cfg: GaussianPeakCurveConfig) -> float:
-    if cfg.spread_hours <= 0:
-        raise ValueError("spread_hours must be > 0")
-    z = (hour - cfg.peak_hour) / cfg.spread_hours
-    return float(cfg.floor) + math.exp(-0.5 * z * z)
-
-
+@lru_cache(maxsize=32)
 def _normalize_daily_shape(
     cfg: GaussianPeakCurveConfig, grid_minutes: int = 1
-) -> tuple[list[float], float, float]:
+) -> tuple[np.ndarray, float, float]:
     """
     Precompute shape on a 24h grid; return (shape_values, shape_max, integral_hours).
     integral_hours approximates ∫ shape(t) dt over 24 hours.
+    Cached per (cfg, grid_minutes); the returned array is read-only since it is shared.
     """
     if grid_minutes <= 0:
         raise ValueError("grid_minutes must be > 0")
+    if cfg.spread_hours <= 0:
+        raise ValueError("spread_hours must be > 0")
 
     n = int((24 * 60) / grid_minutes)
     if n <= 0:
         raise ValueError("invalid grid_minutes")
 
-    shapes: list[float] = []
-    for i in range(n):
-        minute = (i + 0.5) * grid_minutes
-        hour = minute / 60.0
-        shapes.append(_gaussian_shape(hour, cfg))
+    hours = (np.arange(n, dtype=np.float64) + 0.5) * (grid_minutes / 60.0)
+    z = (hours - cfg.peak_hour) / cfg.spread_hours
+    shapes = float(cfg.floor) + np.exp(-0.5 * z * z)
+    shapes.flags.writeable = False
 
-    shape_max = max(shapes)
+    shape_max = float(shapes.max())
     dt_hours = grid_minutes / 60.0
-    integral_hours = sum(shapes) * dt_hours
+    integral_hours = float(shapes.sum()) * dt_hours
     return shapes, shape_max, integral_hours
 
 
-def _shape_at_second(shapes: list[float], second_in_day: float, grid_minutes: int) -> float:
-    second_in_day = max(0.0, min(float(SECONDS_PER_DAY) - 1e-9, float(second_in_day)))
-    minute = second_in_day / 60.0
-    idx = int(minute // grid_minutes)
-    idx = max(0, min(idx, len(shapes) - 1))
-    return shapes[idx]
+def _thin_day_vectorized(
+    gen: np.random.Generator,
+    accept_lut: np.ndarray,
+    intensity_max_sec: float,
+    day_start: float,
+    grid_minutes: int,
+) -> np.ndarray:
+    """
+    Draw one day of NHPP arrival times (absolute sim seconds) by batch thinning.
+    Candidates come from a homogeneous process at intensity_max_sec and are kept
+    with probability accept_lut[grid_slot(t)], i.e. shape(t) / shape_max.
+    """
+    day_end = day_start + float(SECONDS_PER_DAY)
+    scale = 1.0 / intensity_max_sec
+    # ~1.3x the expected candidate count keeps top-up draws rare.
+    batch = max(16, int(1.3 * intensity_max_sec * SECONDS_PER_DAY) + 1)
+
+    chunks: list[np.ndarray] = []
+    t = day_start
+    while t < day_end:
+        times = t + np.cumsum(gen.exponential(scale, size=batch))
+        chunks.append(times)
+        t = float(times[-1])
+
+    times = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+    times = times[times < day_end]
+    u = gen.random(times.size)
+
+    idx = ((times - day_start) / 60.0 // grid_minutes).astype(np.int64)
+    np.clip(idx, 0, accept_lut.size - 1, out=idx)
+    return times[u < accept_lut[idx]]
 
 
 class NHPPBaselineArrivalsModel(ArrivalModel):
@@ -141,48 +167,81 @@ class NHPPBaselineArrivalsModel(ArrivalModel):
             yield env.timeout(horizon_s)
             return
 
+        numpy_generator = getattr(self.rng, "numpy_generator", None)
+        if numpy_generator is not None:
+            gen = numpy_generator()
+            # per-slot acceptance probability, computed once for all days
+            accept_lut = shapes / shape_max
+            for _day in range(self.num_days):
+                day_start = float(env.now)
+                day_end = day_start + float(SECONDS_PER_DAY)
+                arrivals = _thin_day_vectorized(
+                    gen,
+                    accept_lut,
+                    intensity_max_sec,
+                    day_start,
+                    self.grid_minutes,
+                )
+                intent_ids = self._allocate_intent_ids(arrivals.size)
+                for t_arrival, intent_id in zip(arrivals.tolist(), intent_ids, strict=True):
+                    yield env.timeout(t_arrival - env.now)
+                    self._publish_intent(env, intent_id)
+
+                if float(env.now) < day_end:
+                    yield env.timeout(day_end - float(env.now))
+            return
+
+        # scalar fallback for RNGs without a NumPy generator
+        lut = (shapes / shape_max).tolist()
+        last_slot = len(lut) - 1
+        slot_s = 60.0 * self.grid_minutes
+        expovariate = self.rng.expovariate
+        random = self.rng.random
+        day_s = float(SECONDS_PER_DAY)
         for _day in range(self.num_days):
-            day_start = float(env.now)
-            day_end = day_start + float(SECONDS_PER_DAY)
+            day_start = env.now
+            day_end = day_start + day_s
 
             t = day_start
             while True:
-                dt = self.rng.expovariate(intensity_max_sec)
-                t_candidate = t + float(dt)
-                if t_candidate >= day_end:
+                t += expovariate(intensity_max_sec)
+                if t >= day_end:
                     break
 
-                sec_in_day = t_candidate - day_start
-                shape_t = _shape_at_second(shapes, sec_in_day, grid_minutes=self.grid_minutes)
-                intensity_t_sec = (daily_expected * shape_t / integral_hours) / 3600.0
-
-                accept_p = intensity_t_sec / intensity_max_sec
-                if self.rng.random() < accept_p:
-                    yield env.timeout(t_candidate - float(env.now))
-
-                    ts = _assert_utc(self.graph.get_current_time())
-                    intent = SessionIntent(
-                        intent_id=str(self.ids.next_id("intent")),
-                        ts_utc=ts,
-                        sim_time_s=float(env.now),
-                        intent_source="baseline",
-                        channel=None,
-                    )
-                    self.intent_bus.publish(intent)
-
-                    if self.events is not None:
-                        self.events.emit(
-                            "session_intent",
-                            intent_source=intent.intent_source,
-                            channel=intent.channel,
-                            payload={
-                                "intent_id": intent.intent_id,
-                                "intent_source": intent.intent_source,
-                                "channel": intent.channel,
-                            },
-                        )
-
-                t = t_candidate
-
-            if float(env.now) < day_end:
-                yield env.timeout(day_end - float(env.now))
+                # t is in [day_start, day_end), so only the top slot needs clamping
+                slot = min(int((t - day_start) // slot_s), last_slot)
+                if random() < lut[slot]:
+                    yield env.timeout(t - env.now)
+                    self._publish_intent(env, str(self.ids.next_id("intent")))
+
+            if env.now < day_end:
+                yield env.timeout(day_end - env.now)
+
+    def _allocate_intent_ids(self, k: int) -> list[str]:
+        next_ids = getattr(self.ids, "next_ids", None)
+        if next_ids is not None:
+            return next_ids("intent", k)
+        return [str(self.ids.next_id("intent")) for _ in range(k)]
+
+    def _publish_intent(self, env, intent_id: str) -> None:
+        ts = _assert_utc(self.graph.get_current_time())
+        intent = SessionIntent(
+            intent_id=intent_id,
+            ts_utc=ts,
+            sim_time_s=env.now,
+            intent_source="baseline",
+            channel=None,
+        )
+        self.intent_bus.publish(intent)
+
+        if self.events is not None:
+            self.events.emit(
+                "session_intent",
+                intent_source=intent.intent_source,
+                channel=intent.channel,
+                payload={
+                    "intent_id": intent.intent_id,
+                    "intent_source": intent.intent_source,
+                    "channel": intent.channel,
+                },
+            )
@@ -4,6 +4,7 @@ from datetime import UTC, datetime, timedelta
 
 import simpy
 
+from sim.core.rng import RNG
 from sim.features.arrivals.models.nhpp import (
     SECONDS_PER_DAY,
     GaussianPeakCurveConfig,
@@ -17,7 +18,7 @@ class DummyIds:
     def __init__(self) -> None:
         self.n = 0
 
-    def new_id(self, prefix: str) -> str:
+    def next_id(self, prefix: str) -> str:
         self.n += 1
         return f"{prefix}_{self.n}"
 
@@ -160,3 +161,39 @@ def test_nhpp_zero_expected_intents_produces_none() -> None:
     env.run(until=SECONDS_PER_DAY)
 
     assert bus.items == []
+
+
+def test_nhpp_vectorized_path_reproducible_and_peaked() -> None:
+    cfg = NHPPBaselineArrivalsConfig(
+        daily_expected_intents=800.0,
+        intraday_curve=GaussianPeakCurveConfig(peak_hour=12.0, spread_hours=2.5, floor=0.05),
+    )
+
+    def run_once(seed: int) -> list[float]:
+        env = simpy.Environment()
+        bus = ListBus()
+        model = NHPPBaselineArrivalsModel(
+            run_id="run_vec",
+            rng=RNG(seed),
+            ids=DummyIds(),
+            graph=DummyGraph(env, datetime(2026, 1, 1, tzinfo=UTC)),
+            intent_bus=bus,
+            cfg=cfg,
+            num_days=2,
+            events=None,
+        )
+        model.start(env)
+        env.run(until=2 * SECONDS_PER_DAY)
+        return [x.sim_time_s for x in bus.items]
+
+    t1 = run_once(42)
+    assert t1 == run_once(42)
+    assert t1 == sorted(t1)
+    assert all(0.0 <= t < 2 * SECONDS_PER_DAY for t in t1)
+    # Poisson(1600): well inside +/- 5 sigma
+    assert 1400 < len(t1) < 1800
+
+    hours = [(t / 3600.0) % 24.0 for t in t1]
+    night = sum(1 for h in hours if 2.0 <= h < 4.0)
+    peak = sum(1 for h in hours if 11.0 <= h < 13.0)
+    assert peak > night
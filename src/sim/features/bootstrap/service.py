@@ -1,23 +1,28 @@
 from __future__ import annotations
 
+import inspect
+import itertools
 import sys
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import simpy
 
 from sim.core.config import SimulationConfig
-from sim.core.ids import IdsService, deterministic_run_id_from_config
+from sim.core.ids import (
+    IdsService,
+    deterministic_run_id_from_config,
+    deterministic_run_id_from_file,
+)
 from sim.core.logging import get_logger
 from sim.core.rng import RNG
 from sim.core.types import RunContext
-from sim.features.arrivals.models.nhpp import GaussianPeakCurveConfig
-from sim.features.arrivals.service import ArrivalsService, BaselineArrivalsConfig
 from sim.features.conversion.service import ConversionConfig, ConversionService
+from sim.features.events.schema import ALLOWED_EVENT_TYPES
 from sim.features.events.service import EventService
 from sim.features.intent_resolver.service import IntentResolverService
-from sim.features.intent_resolver.types import IntentResolverConfig
+from sim.features.intent_resolver.types import IntentLike, IntentResolverConfig
 from sim.features.persistence.duckdb_adapter import DuckDBAdapter
 from sim.features.persistence.service import PersistenceService
 from sim.features.session_intent.service import SessionIntentService
@@ -32,21 +37,154 @@ from sim.features.users_state.service import (
     UsersStateService,
 )
 
+if TYPE_CHECKING:
+    from sim.features.arrivals.service import BaselineArrivalsConfig
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BootstrapResult:
     ctx: RunContext
     duckdb_path: str
 
 
 class _IdsEventIdAdapter:
-    """Adapts IdsService to the events feature IdGenerator protocol."""
+    """Adapts IdsService to the events feature IdGenerator protocol.
+
+    Event ids use the IdsService "evt_<run_id>_<n:08d>" format but are issued from a
+    local monotonic counter, since nothing else allocates from the "evt" prefix.
+    """
 
     def __init__(self, ids: IdsService) -> None:
-        self._ids = ids
+        self._prefix = f"evt_{ids.run_id}_"
+        self._counter = itertools.count(1)
 
     def next_event_id(self) -> str:
-        return str(self._ids.next_id("evt"))
+        return self._prefix + str(next(self._counter)).zfill(8)
+
+
+class _IntentBusAdapter:
+    """Arrivals-facing bus: publish(intent) forwards onto SessionIntentService.
+
+    The bus signature is probed once here; publish is bound to the matching
+    forwarder so the per-intent path carries no branching or fallbacks.
+    """
+
+    __slots__ = ("publish",)
+
+    def __init__(self, bus: SessionIntentService) -> None:
+        publish_nowait = getattr(bus, "publish_nowait", None)
+        if publish_nowait is not None:
+            build_intent = bus.build_intent
+
+            # arrivals never wait on the put, so skip building a put event per intent
+            def publish(intent) -> None:
+                publish_nowait(
+                    build_intent(
+                        ts_utc=intent.ts_utc,
+                        intent_source=intent.intent_source,
+                        channel=intent.channel,
+                        audience_id=intent.audience_id,
+                        payload=intent.payload,
+                    )
+                )
+
+            self.publish = publish
+            return
+
+        publish_new = bus.publish_new
+        params = inspect.signature(publish_new).parameters
+        if "audience_id" in params and "payload" in params:
+
+            def publish(intent) -> None:
+                publish_new(
+                    ts_utc=intent.ts_utc,
+                    intent_source=intent.intent_source,
+                    channel=intent.channel,
+                    audience_id=intent.audience_id,
+                    payload=intent.payload,
+                )
+
+        else:
+
+            def publish(intent) -> None:
+                publish_new(
+                    ts_utc=intent.ts_utc,
+                    intent_source=intent.intent_source,
+                    channel=intent.channel,
+                )
+
+        self.publish = publish
+
+
+class _RealSessionRunner:
+    """Session runner used by the intent resolver; applies discovery-mode multipliers."""
+
+    __slots__ = (
+        "_spawn",
+        "_get_user",
+        "_queue_end",
+        "_conversion",
+        "_dm_enabled",
+        "_dm_mult",
+        "_dm_shift",
+    )
+
+    def __init__(
+        self,
+        sessions_: SessionsService,
+        *,
+        users: UsersStateService,
+        conversion: ConversionService | None,
+    ) -> None:
+        self._spawn = sessions_.spawn
+        self._get_user = users.get_user
+        self._queue_end = users.queue_session_end
+        self._conversion = conversion
+
+        # Discovery-mode config is immutable for the run; snapshot it once.
+        dm = users.cfg.discovery_mode
+        self._dm_enabled = bool(dm.enabled)
+        self._dm_mult = float(dm.dropoff_multiplier)
+        self._dm_shift = float(dm.conversion_logit_shift)
+
+    def start_session(self, *, user_id: str, session_id: str, intent: IntentLike) -> Any:
+        """
+        Spawn the session process directly and record the session end from its
+        completion callback, instead of wrapping it in a second process that only
+        waits on it.
+        """
+        u = self._get_user(user_id)
+        propensity = u.propensity if u is not None else 0.5
+
+        drop_mult = 1.0
+        logit_shift = 0.0
+        if self._dm_enabled and u is not None and u.discovery_mode:
+            drop_mult = self._dm_mult
+            logit_shift = self._dm_shift
+
+        proc = self._spawn(
+            user_id=user_id,
+            session_id=session_id,
+            intent_source=intent.intent_source,
+            channel=intent.channel or "direct",
+            conversion=self._conversion,
+            user_propensity=propensity,
+            dropoff_multiplier=drop_mult,
+            conversion_logit_shift=logit_shift,
+        )
+        queue_end = self._queue_end
+        end_ts = intent.ts_utc
+        proc.callbacks.append(lambda _ev: queue_end(user_id=user_id, now_utc=end_ts))
+        return proc
+
+
+class _ChannelsCtx:
+    """Minimal ctx adapter expected by ChannelsExposureService (ctx.rng)."""
+
+    __slots__ = ("rng",)
+
+    def __init__(self, rng_: RNG) -> None:
+        self.rng = rng_
 
 
 def _build_graph(
@@ -114,11 +252,87 @@ def _parse_users_config(raw: dict[str, Any]) -> UsersConfig:
     )
 
 
+def _parse_baseline_arrivals_config(raw: dict[str, Any]) -> BaselineArrivalsConfig | None:
+    if "arrivals" not in raw:
+        return None
+    # Arrivals (and its NHPP model) are only imported when the config enables them.
+    from sim.features.arrivals.models.nhpp import GaussianPeakCurveConfig
+    from sim.features.arrivals.service import BaselineArrivalsConfig
+
+    a_raw = raw.get("arrivals") or {}
+    # Back-compat: support either "baseline_intents" or "baseline_arrivals"
+    b_raw = a_raw.get("baseline_intents") or a_raw.get("baseline_arrivals") or {}
+    curve_raw = b_raw.get("intraday_curve") or {}
+    return BaselineArrivalsConfig(
+        model=str(b_raw.get("model", "nhpp")),
+        daily_expected_intents=float(b_raw.get("daily_expected_intents", 0.0)),
+        intraday_curve=GaussianPeakCurveConfig(
+            peak_hour=float(curve_raw.get("peak_hour", 12.0)),
+            spread_hours=float(curve_raw.get("spread_hours", 3.0)),
+            floor=float(curve_raw.get("floor", 0.05)),
+        ),
+    )
+
+
+def _parse_conversion_config(raw: dict[str, Any]) -> ConversionConfig | None:
+    if "conversion" not in raw:
+        return None
+    c_raw = raw.get("conversion") or {}
+    return ConversionConfig(
+        model=str(c_raw.get("model", "logistic")),
+        cap=float(c_raw.get("cap", 0.35)),
+        base_logit=float(c_raw.get("base_logit", -3.0)),
+        propensity_coef=float(c_raw.get("propensity_coef", 2.0)),
+    )
+
+
+def _parse_sessions_config(raw: dict[str, Any]) -> SessionsConfig:
+    s_raw = raw.get("sessions") or {}
+    ipt_raw = s_raw.get("inter_page_time") or {}
+    max_steps = s_raw.get("max_steps", 12)
+    return SessionsConfig(
+        inactivity_timeout_minutes=float(s_raw.get("inactivity_timeout_minutes", 30.0)),
+        max_steps=None if max_steps is None else int(max_steps),
+        entry_page=str(s_raw.get("entry_page", "home")),
+        inter_page_time=InterPageTimeConfig(
+            dist=str(ipt_raw.get("dist", "fixed")),
+            fixed_seconds=float(ipt_raw.get("fixed_seconds", 10.0)),
+            mean_seconds=float(ipt_raw.get("mean_seconds", 10.0)),
+        ),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _BootstrapPlan:
+    """Feature configs parsed from cfg.raw once, before any service is built."""
+
+    users: UsersConfig
+    sessions: SessionsConfig
+    baseline: BaselineArrivalsConfig | None
+    conversion: ConversionConfig | None
+
+
+def _build_plan(raw: dict[str, Any]) -> _BootstrapPlan:
+    return _BootstrapPlan(
+        users=_parse_users_config(raw),
+        sessions=_parse_sessions_config(raw),
+        baseline=_parse_baseline_arrivals_config(raw),
+        conversion=_parse_conversion_config(raw),
+    )
+
+
 def bootstrap_run(cfg: SimulationConfig, config_path: str | None = None) -> BootstrapResult:
     raw: dict[str, Any] = cfg.raw if isinstance(cfg.raw, dict) else {}
+    plan = _build_plan(raw)
 
     # ----- run identity -----
-    run_id = deterministic_run_id_from_config(raw) if cfg.run.run_id == "auto" else cfg.run.run_id
+    if cfg.run.run_id != "auto":
+        run_id = cfg.run.run_id
+    elif config_path is not None:
+        # the YAML file is the source of truth; hash its bytes instead of re-serializing raw
+        run_id = deterministic_run_id_from_file(config_path)
+    else:
+        run_id = deterministic_run_id_from_config(raw)
     logger = get_logger("sim", cfg.logging.level)
 
     rng = RNG(cfg.run.seed)
@@ -130,19 +344,21 @@ def bootstrap_run(cfg: SimulationConfig, config_path: str | None = None) -> Boot
     env = simpy.Environment()
 
     # ----- cold storage -----
-    adapter = DuckDBAdapter(path=cfg.storage.duckdb_path, clean_slate=cfg.storage.clean_slate)
+    adapter = DuckDBAdapter(
+        path=cfg.storage.duckdb_path,
+        clean_slate=cfg.storage.clean_slate,
+        event_types=ALLOWED_EVENT_TYPES if cfg.storage.event_type_enum else None,
+        threads=cfg.storage.duckdb.threads,
+        memory_limit=cfg.storage.duckdb.memory_limit,
+        checkpoint_threshold=cfg.storage.duckdb.checkpoint_threshold,
+        temp_directory=cfg.storage.duckdb.temp_directory,
+    )
     persistence = PersistenceService(
         adapter=adapter,
         every_n_events=cfg.storage.flush.every_n_events,
         or_every_seconds=cfg.storage.flush.or_every_seconds,
-    )
-    # REMOVE
-    print(
-        f"[FLUSH CONFIG] every_n_events={cfg.storage.flush.every_n_events} "
-        f"or_every_seconds={cfg.storage.flush.or_every_seconds}"
-    )
-    print(
-        f"[PERSISTENCE] every_n_events={persistence.every_n_events} or_every_seconds={persistence.or_every_seconds}"
+        background=cfg.storage.flush.background,
+        min_flush_interval_s=cfg.storage.flush.min_interval_s,
     )
     persistence.open()
     persistence.start_periodic_flush(env)
@@ -172,125 +388,40 @@ def bootstrap_run(cfg: SimulationConfig, config_path: str | None = None) -> Boot
         # It is intentionally not used here yet.
 
         # ----- users hot state -----
-        users_cfg = _parse_users_config(raw)
-        users = UsersStateService(cfg=users_cfg)
+        users = UsersStateService(cfg=plan.users)
 
         # ----- session intents store -----
         session_intents = SessionIntentService(env=env, ids=ids, capacity=None)
 
         # Arrivals expects an intent bus with publish(intent)
-        class IntentBusAdapter:
-            def __init__(self, bus: SessionIntentService) -> None:
-                self._bus = bus
-
-            def publish(self, intent) -> None:
-                self._bus.publish_new(
-                    ts_utc=intent.ts_utc,
-                    intent_source=intent.intent_source,
-                    channel=intent.channel,
-                    audience_id=getattr(intent, "audience_id", None),
-                    payload=getattr(intent, "payload", None),
-                )
-
-        intent_bus = IntentBusAdapter(session_intents)
+        intent_bus = _IntentBusAdapter(session_intents)
 
         # ----- arrivals (baseline intents) -----
-        if "arrivals" in raw:
-            a_raw = raw.get("arrivals") or {}
-            # Back-compat: support either "baseline_intents" or "baseline_arrivals"
-            b_raw = a_raw.get("baseline_intents") or a_raw.get("baseline_arrivals") or {}
-            curve_raw = b_raw.get("intraday_curve") or {}
-            baseline_cfg = BaselineArrivalsConfig(
-                model=str(b_raw.get("model", "nhpp")),
-                daily_expected_intents=float(b_raw.get("daily_expected_intents", 0.0)),
-                intraday_curve=GaussianPeakCurveConfig(
-                    peak_hour=float(curve_raw.get("peak_hour", 12.0)),
-                    spread_hours=float(curve_raw.get("spread_hours", 3.0)),
-                    floor=float(curve_raw.get("floor", 0.05)),
-                ),
-            )
+        if plan.baseline is not None:
+            from sim.features.arrivals.service import ArrivalsService
+
             arrivals = ArrivalsService(
                 run_id=ctx.run_id,
                 rng=rng,
                 ids=ids,
                 graph=graph,
                 intent_bus=intent_bus,
-                baseline_arrivals=baseline_cfg,
+                baseline_arrivals=plan.baseline,
                 num_days=int(cfg.run.num_days),
                 events=events,
             )
             arrivals.start(env)
 
         # ----- conversion -----
-        conversion: ConversionService | None = None
-        if "conversion" in raw:
-            c_raw = raw.get("conversion") or {}
-            conversion = ConversionService(
-                ConversionConfig(
-                    model=str(c_raw.get("model", "logistic")),
-                    cap=float(c_raw.get("cap", 0.35)),
-                    base_logit=float(c_raw.get("base_logit", -3.0)),
-                    propensity_coef=float(c_raw.get("propensity_coef", 2.0)),
-                )
-            )
+        conversion = ConversionService(plan.conversion) if plan.conversion is not None else None
 
         # ----- sessions -----
-        s_raw = raw.get("sessions") or {}
-        ipt_raw = s_raw.get("inter_page_time") or {}
-        sessions_cfg = SessionsConfig(
-            inactivity_timeout_minutes=float(s_raw.get("inactivity_timeout_minutes", 30.0)),
-            max_steps=None
-            if s_raw.get("max_steps", 12) is None
-            else int(s_raw.get("max_steps", 12)),
-            entry_page=str(s_raw.get("entry_page", "home")),
-            inter_page_time=InterPageTimeConfig(
-                dist=str(ipt_raw.get("dist", "fixed")),
-                fixed_seconds=float(ipt_raw.get("fixed_seconds", 10.0)),
-                mean_seconds=float(ipt_raw.get("mean_seconds", 10.0)),
-            ),
-        )
         sessions_svc = SessionsService(
-            env=env, graph=graph, rng=rng, events=events, cfg=sessions_cfg
+            env=env, graph=graph, rng=rng, events=events, cfg=plan.sessions
         )
 
         # ----- session runner used by intent resolver -----
-        class RealSessionRunner:
-            def __init__(self, env_: simpy.Environment, sessions_: SessionsService) -> None:
-                self._env = env_
-                self._sessions = sessions_
-
-            def start_session(self, *, user_id: str, session_id: str, intent) -> Any:
-                return self._env.process(
-                    self._run(user_id=user_id, session_id=session_id, intent=intent)
-                )
-
-            def _run(self, *, user_id: str, session_id: str, intent):
-                u = users.get_user(user_id)
-                propensity = float(getattr(u, "propensity", 0.5)) if u is not None else 0.5
-                is_disc = bool(getattr(u, "discovery_mode", False)) if u is not None else False
-
-                drop_mult = 1.0
-                logit_shift = 0.0
-                if is_disc and bool(users.cfg.discovery_mode.enabled):
-                    drop_mult = float(users.cfg.discovery_mode.dropoff_multiplier)
-                    logit_shift = float(users.cfg.discovery_mode.conversion_logit_shift)
-
-                channel_out = getattr(intent, "channel", None) or "direct"
-
-                proc = self._sessions.spawn(
-                    user_id=user_id,
-                    session_id=session_id,
-                    intent_source=getattr(intent, "intent_source", None),
-                    channel=channel_out,
-                    conversion=conversion,
-                    user_propensity=propensity,
-                    dropoff_multiplier=drop_mult,
-                    conversion_logit_shift=logit_shift,
-                )
-                yield proc
-                users.mark_session_end(user_id=user_id, now_utc=intent.ts_utc)
-
-        session_runner = RealSessionRunner(env, sessions_svc)
+        session_runner = _RealSessionRunner(sessions_svc, users=users, conversion=conversion)
 
         # ----- intent resolver -----
         resolver = IntentResolverService(
@@ -339,11 +470,6 @@ def bootstrap_run(cfg: SimulationConfig, config_path: str | None = None) -> Boot
                     )
                 )
 
-            # Minimal ctx adapter expected by ChannelsExposureService (ctx.rng)
-            class _ChannelsCtx:
-                def __init__(self, rng_: RNG) -> None:
-                    self.rng = rng_
-
             channels_svc = ChannelsExposureService(
                 cfg=ChannelsExposureConfig(enabled=ce_enabled),
                 channels=build_channels(cfgs),
@@ -361,7 +487,7 @@ def bootstrap_run(cfg: SimulationConfig, config_path: str | None = None) -> Boot
             )
 
         # ----- run lifecycle -----
-        events.emit("run_started")
+        events.emit_immediate("run_started")
 
         horizon_s = int(cfg.run.num_days) * 86400
         logger.info(
@@ -383,8 +509,8 @@ def bootstrap_run(cfg: SimulationConfig, config_path: str | None = None) -> Boot
 
         print(f"[SIMULATION ENDED] run_id={ctx.run_id}")
 
-        events.emit("run_finished")
-        persistence.flush(reason="bootstrap_finish")
+        # flushes whatever is still buffered, then run_finished, in one batch
+        events.emit_immediate("run_finished")
     finally:
         persistence.close()
 
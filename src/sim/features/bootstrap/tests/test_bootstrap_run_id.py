@@ -1,11 +1,13 @@
 from sim.core.config import parse_config
 from sim.features.bootstrap.service import bootstrap_run
 
+# run_id only depends on config; the on-disk path is covered by test_bootstrap_duckdb_events.
 
-def test_run_id_auto_is_deterministic(tmp_path):
+
+def test_run_id_auto_is_deterministic():
     cfg_dict = {
         "run": {"run_id": "auto", "seed": 123, "start_date": "2026-01-01", "num_days": 1},
-        "storage": {"duckdb_path": str(tmp_path / "sim.duckdb"), "clean_slate": True},
+        "storage": {"duckdb_path": ":memory:", "clean_slate": True},
         "logging": {"level": "INFO"},
     }
     cfg = parse_config(cfg_dict)
@@ -16,10 +18,10 @@ def test_run_id_auto_is_deterministic(tmp_path):
     assert r1.ctx.run_id == r2.ctx.run_id
 
 
-def test_run_id_respects_explicit_value(tmp_path):
+def test_run_id_respects_explicit_value():
     cfg_dict = {
         "run": {"run_id": "my_run", "seed": 123, "start_date": "2026-01-01", "num_days": 1},
-        "storage": {"duckdb_path": str(tmp_path / "sim.duckdb"), "clean_slate": True},
+        "storage": {"duckdb_path": ":memory:", "clean_slate": True},
         "logging": {"level": "INFO"},
     }
     cfg = parse_config(cfg_dict)
@@ -3,6 +3,8 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass
 
+import numpy as np
+
 from sim.core.rng import RNG
 
 
@@ -34,12 +36,8 @@ class ConversionService:
 
     @staticmethod
     def _sigmoid(x: float) -> float:
-        # Numerically stable sigmoid
-        if x >= 0:
-            z = math.exp(-x)
-            return 1.0 / (1.0 + z)
-        z = math.exp(x)
-        return z / (1.0 + z)
+        # Branchless and overflow-free: sigmoid(x) == (1 + tanh(x / 2)) / 2
+        return 0.5 * (1.0 + math.tanh(0.5 * x))
 
     def probability(self, *, propensity: float, logit_shift: float = 0.0) -> float:
         p = float(propensity)
@@ -54,6 +52,17 @@ class ConversionService:
             prob = cap
         return 0.0 if prob < 0.0 else 1.0 if prob > 1.0 else prob
 
+    def probabilities(
+        self, propensity: np.ndarray, logit_shift: np.ndarray | float = 0.0
+    ) -> np.ndarray:
+        """Vectorized probability(...) over arrays of propensities / logit shifts."""
+        p = np.clip(np.asarray(propensity, dtype=np.float64), 0.0, 1.0)
+        logit = float(self.cfg.base_logit) + float(self.cfg.propensity_coef) * p + logit_shift
+        # same tanh form as _sigmoid
+        prob = 0.5 * (1.0 + np.tanh(0.5 * logit))
+        np.minimum(prob, float(self.cfg.cap), out=prob)
+        return prob
+
     def should_convert(
         self, *, propensity: float, logit_shift: float = 0.0, rng: RNG
     ) -> tuple[bool, float]:
@@ -47,3 +47,20 @@ def test_should_convert_uses_rng_threshold() -> None:
 
     did, _ = svc.should_convert(propensity=0.5, rng=DummyRng(0.50))
     assert did is False
+
+
+def test_probabilities_matches_scalar() -> None:
+    import numpy as np
+
+    svc = ConversionService(
+        ConversionConfig(model="logistic", cap=0.35, base_logit=-3.0, propensity_coef=2.0)
+    )
+    props = np.array([-0.5, 0.0, 0.25, 0.9, 1.5])
+    shifts = np.array([0.0, -0.8, 0.0, 5.0, 0.0])
+
+    got = svc.probabilities(props, shifts)
+    want = [
+        svc.probability(propensity=float(p), logit_shift=float(s))
+        for p, s in zip(props, shifts, strict=True)
+    ]
+    assert np.allclose(got, want, rtol=0.0, atol=1e-12)
@@ -7,31 +7,40 @@ from datetime import datetime
 from typing import Any
 
 # Keep this list tight; expand deliberately as you add features.
-ALLOWED_EVENT_TYPES: set[str] = {
-    # upstream drivers
-    "session_intent",
-    "user_created",
-    # marketing touches
-    "exposure",
-    "click",
-    # session lifecycle + navigation
-    "session_start",
-    "page_view",
-    "drop_off",
-    "conversion",
-    "session_end",
-    # run lifecycle (optional but useful for smoke tests)
-    "run_started",
-    "run_finished",
-}
+ALLOWED_EVENT_TYPES: frozenset[str] = frozenset(
+    {
+        # upstream drivers
+        "session_intent",
+        "user_created",
+        # marketing touches
+        "exposure",
+        "click",
+        # session lifecycle + navigation
+        "session_start",
+        "page_view",
+        "drop_off",
+        "conversion",
+        "session_end",
+        # run lifecycle (optional but useful for smoke tests)
+        "run_started",
+        "run_finished",
+    }
+)
 
 # Events that are expected to be tied to a session process
-SESSION_SCOPED_EVENT_TYPES: set[str] = {
-    "session_start",
-    "page_view",
-    "drop_off",
-    "conversion",
-    "session_end",
+SESSION_SCOPED_EVENT_TYPES: frozenset[str] = frozenset(
+    {
+        "session_start",
+        "page_view",
+        "drop_off",
+        "conversion",
+        "session_end",
+    }
+)
+
+# event_type -> requires session_id; one lookup validates both contracts
+EVENT_TYPE_REQUIRES_SESSION: dict[str, bool] = {
+    t: t in SESSION_SCOPED_EVENT_TYPES for t in ALLOWED_EVENT_TYPES
 }
 
 
@@ -62,7 +71,7 @@ class Event:
             "run_id": self.run_id,
             "event_id": self.event_id,
             "ts_utc": self.ts_utc,
-            "sim_time_s": float(self.sim_time_s),
+            "sim_time_s": self.sim_time_s,
             "user_id": self.user_id,
             "session_id": self.session_id,
             "event_type": self.event_type,
@@ -76,7 +85,8 @@ class Event:
 
 
 def json_dumps(payload: Mapping[str, Any] | None) -> str | None:
-    if payload is None:
-        return None
-    # Stable JSON for deterministic outputs/diffs
+    if not payload:
+        return None if payload is None else "{}"
+    # Stable JSON for deterministic outputs/diffs: stdlib only, so payload_json text does
+    # not depend on which optional packages are installed.
     return json.dumps(dict(payload), sort_keys=True, separators=(",", ":"), default=str)
@@ -1,15 +1,14 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Protocol
 
 import simpy
 
 from sim.features.events.schema import (
     ALLOWED_EVENT_TYPES,
-    SESSION_SCOPED_EVENT_TYPES,
-    Event,
+    EVENT_TYPE_REQUIRES_SESSION,
     json_dumps,
 )
 from sim.features.events.types import EventsEmitter
@@ -32,10 +31,34 @@ class CounterEventIdGenerator:
 
     run_id: str
     counter: int = 0
+    _prefix: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._prefix = f"{self.run_id}_"
 
     def next_event_id(self) -> str:
         self.counter += 1
-        return f"{self.run_id}_{self.counter:08d}"
+        return self._prefix + format(self.counter, "08d")
+
+
+def _check_event_contract(event_type: str, *, session_id: str | None, channel: str | None) -> None:
+    requires_session = EVENT_TYPE_REQUIRES_SESSION.get(event_type)
+    if requires_session is None:
+        raise ValueError(
+            f"Unsupported event_type={event_type!r}. Allowed={sorted(ALLOWED_EVENT_TYPES)}"
+        )
+
+    # Session-scoped events must have session_id
+    if requires_session and session_id is None:
+        raise ValueError(f"{event_type} requires session_id")
+
+    # If a session_id is present, channel must be present (persist origin channel across session)
+    if session_id is not None and channel is None:
+        raise ValueError(
+            "channel must be provided when session_id is set "
+            "(persist origin channel across session events). "
+            "For baseline sessions, use channel='direct'."
+        )
 
 
 class EventService(EventsEmitter):
@@ -43,7 +66,8 @@ class EventService(EventsEmitter):
 
     - Stamps: run_id, event_id, ts_utc, sim_time_s
     - Enforces: basic event contracts
-    - Routes: to PersistenceService via .append(row)
+    - Routes: to PersistenceService via .append_values(values) when available,
+      otherwise .append(row)
     """
 
     def __init__(
@@ -63,6 +87,13 @@ class EventService(EventsEmitter):
         self._run_id = run_id
         self._logger = logger
 
+        # Columnar sinks (PersistenceService) accept a values tuple directly.
+        self._append_values = getattr(persistence, "append_values", None)
+
+        # Bound once: emit() runs per event and would otherwise resolve these each call.
+        self._next_event_id = ids.next_event_id
+        self._current_epoch = graph.get_current_epoch if self._append_values is not None else None
+
     @property
     def run_id(self) -> str:
         return self._run_id
@@ -79,53 +110,104 @@ class EventService(EventsEmitter):
         value_num: float | None = None,
         value_str: str | None = None,
         payload: dict[str, Any] | None = None,
-    ) -> Event:
-        if event_type not in ALLOWED_EVENT_TYPES:
-            raise ValueError(
-                f"Unsupported event_type={event_type!r}. Allowed={sorted(ALLOWED_EVENT_TYPES)}"
+    ) -> None:
+        # Happy path is one dict lookup; the helper only runs to raise the specific error.
+        requires_session = EVENT_TYPE_REQUIRES_SESSION.get(event_type)
+        if session_id is None:
+            if requires_session is None or requires_session:
+                _check_event_contract(event_type, session_id=session_id, channel=channel)
+        elif requires_session is None or channel is None:
+            _check_event_contract(event_type, session_id=session_id, channel=channel)
+
+        event_id = self._next_event_id()
+        sim_time_s = self._env.now
+        append_values = self._append_values
+        if append_values is not None:
+            # tuple in persistence EVENTS_COLUMNS order; ts_utc as epoch seconds, so
+            # no per-event datetime or row dict
+            append_values(
+                (
+                    self._run_id,
+                    event_id,
+                    self._current_epoch(),
+                    sim_time_s,
+                    user_id,
+                    session_id,
+                    event_type,
+                    intent_source,
+                    channel,
+                    page,
+                    value_num,
+                    value_str,
+                    json_dumps(payload),
+                )
             )
-
-        # Session-scoped events must have session_id
-        if event_type in SESSION_SCOPED_EVENT_TYPES and session_id is None:
-            raise ValueError(f"{event_type} requires session_id")
-
-        # If a session_id is present, channel must be present (persist origin channel across session)
-        if session_id is not None and channel is None:
-            raise ValueError(
-                "channel must be provided when session_id is set "
-                "(persist origin channel across session events). "
-                "For baseline sessions, use channel='direct'."
+        else:
+            # same shape as Event.as_row(), built without the intermediate Event
+            self._persistence.append(
+                {
+                    "run_id": self._run_id,
+                    "event_id": event_id,
+                    "ts_utc": self._graph.get_current_time(),
+                    "sim_time_s": sim_time_s,
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "event_type": event_type,
+                    "intent_source": intent_source,
+                    "channel": channel,
+                    "page": page,
+                    "value_num": value_num,
+                    "value_str": value_str,
+                    "payload_json": json_dumps(payload),
+                }
             )
 
-        event = Event(
-            run_id=self._run_id,
-            event_id=self._ids.next_event_id(),
-            ts_utc=self._graph.get_current_time(),
-            sim_time_s=float(self._env.now),
-            event_type=event_type,
-            user_id=user_id,
-            session_id=session_id,
-            intent_source=intent_source,
-            channel=channel,
-            page=page,
-            value_num=value_num,
-            value_str=value_str,
-            payload_json=json_dumps(payload),
-        )
-
-        self._persistence.append(event.as_row())
-
         if self._logger is not None and self._logger.isEnabledFor(logging.DEBUG):
             self._logger.debug(
                 "event_emitted",
                 extra={
-                    "run_id": event.run_id,
-                    "event_type": event.event_type,
-                    "event_id": event.event_id,
-                    "sim_time_s": event.sim_time_s,
-                    "user_id": event.user_id,
-                    "session_id": event.session_id,
-                    "channel": event.channel,
-                    "page": event.page,
+                    "run_id": self._run_id,
+                    "event_type": event_type,
+                    "event_id": event_id,
+                    "sim_time_s": sim_time_s,
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "channel": channel,
+                    "page": page,
                 },
             )
+
+    def emit_immediate(
+        self,
+        event_type: str,
+        *,
+        payload: dict[str, Any] | None = None,
+    ) -> None:
+        """Emit a run-scoped bookend event (run_started / run_finished) durably.
+
+        The row is built directly and handed to the sink's append_immediate(row)
+        when available, so it reaches storage without waiting for the next batch.
+        """
+        _check_event_contract(event_type, session_id=None, channel=None)
+
+        row = {
+            "run_id": self._run_id,
+            "event_id": self._ids.next_event_id(),
+            "ts_utc": self._graph.get_current_time(),
+            "sim_time_s": self._env.now,
+            "user_id": None,
+            "session_id": None,
+            "event_type": event_type,
+            "intent_source": None,
+            "channel": None,
+            "page": None,
+            "value_num": None,
+            "value_str": None,
+            "payload_json": json_dumps(payload),
+        }
+
+        append_immediate = getattr(self._persistence, "append_immediate", None)
+        if append_immediate is not None:
+            append_immediate(row)
+        else:
+            self._persistence.append(row)
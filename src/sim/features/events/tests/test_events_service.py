@@ -142,3 +142,55 @@ def test_deterministic_ids_increment():
         "run_det_00000002",
         "run_det_00000003",
     ]
+
+
+def test_emit_immediate_routes_to_append_immediate():
+    from sim.features.events.service import CounterEventIdGenerator, EventService
+
+    class ImmediateSink(DummySink):
+        def __init__(self) -> None:
+            super().__init__()
+            self.immediate: list[dict] = []
+
+        def append_immediate(self, row: dict) -> None:
+            self.immediate.append(row)
+
+    env = simpy.Environment()
+    sink = ImmediateSink()
+    svc = EventService(
+        env=env,
+        graph=make_graph(env),
+        persistence=sink,
+        ids=CounterEventIdGenerator(run_id="run_x"),
+        run_id="run_x",
+    )
+
+    svc.emit_immediate("run_started")
+
+    assert sink.rows == []
+    assert len(sink.immediate) == 1
+    row = sink.immediate[0]
+    assert row["event_type"] == "run_started"
+    assert row["event_id"] == "run_x_00000001"
+    assert row["ts_utc"].tzinfo is not None
+
+
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        ({"a": "é"}, '{"a":"\\u00e9"}'),
+        ({"x": 1e16}, '{"x":1e+16}'),
+        ({"x": float("nan")}, '{"x":NaN}'),
+        ({"b": 2, "a": [1, None]}, '{"a":[1,null],"b":2}'),
+    ],
+)
+def test_json_dumps_is_the_stdlib_encoding(payload, expected) -> None:
+    import json
+
+    from sim.features.events import schema
+
+    # payload_json must not depend on optional packages (e.g. orjson) being installed
+    assert not hasattr(schema, "orjson")
+    out = schema.json_dumps(payload)
+    assert out == expected
+    assert out == json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
@@ -7,7 +7,12 @@ import simpy
 
 from sim.core.ids import IdsService
 from sim.core.rng import RNG
-from sim.features.intent_resolver.types import EventSink, IntentResolverConfig, SessionRunner
+from sim.features.intent_resolver.types import (
+    EventSink,
+    IntentLike,
+    IntentResolverConfig,
+    SessionRunner,
+)
 from sim.features.session_intent.types import SessionIntent
 from sim.features.users_state.service import UsersStateService
 
@@ -44,39 +49,26 @@ class IntentResolverService:
     def start(self) -> simpy.events.Process:
         return self.env.process(self._run_loop())
 
-    def _emit(
-        self,
-        event_type: str,
-        *,
-        user_id: str | None = None,
-        session_id: str | None = None,
-        intent: SessionIntent | None = None,
-    ) -> None:
-        intent_source = getattr(intent, "intent_source", None) if intent is not None else None
-        channel = getattr(intent, "channel", None) if intent is not None else None
-        channel_out = channel or "direct"
-
-        payload: dict[str, Any] | None = None
-        if intent is not None:
-            payload = dict(getattr(intent, "payload", None) or {})
-            # Keep schema stable: store optional fields in payload_json
-            if getattr(intent, "intent_id", None) is not None:
-                payload["intent_id"] = intent.intent_id
-            if getattr(intent, "audience_id", None) is not None:
-                payload["audience_id"] = intent.audience_id
-            if not payload:
-                payload = None
-
-        self.sink.emit(
-            event_type,
-            user_id=user_id,
-            session_id=session_id,
-            intent_source=intent_source,
-            channel=channel_out
-            if session_id is not None
-            else channel,  # session-scoped needs channel
-            payload=payload,
-        )
+    @staticmethod
+    def _intent_payload(intent: IntentLike) -> dict[str, Any] | None:
+        """
+        Merge intent.payload with intent_id/audience_id in one dict build.
+        Keep schema stable: optional fields live in payload_json. The result is
+        shared by every event emitted for this intent, so sinks must not mutate it.
+        """
+        base = intent.payload
+        intent_id = intent.intent_id
+        audience_id = intent.audience_id
+
+        if intent_id is None and audience_id is None:
+            return dict(base) if base else None
+
+        payload: dict[str, Any] = {**base} if base else {}
+        if intent_id is not None:
+            payload["intent_id"] = intent_id
+        if audience_id is not None:
+            payload["audience_id"] = audience_id
+        return payload
 
     def _resolve_user(self, *, ts_utc) -> tuple[str, bool]:
         u, is_new = self.users.get_or_create_user_for_intent(now_utc=ts_utc, rng=self.rng)
@@ -89,22 +81,45 @@ class IntentResolverService:
         if not self.cfg.enabled:
             return
 
-        # Canonical timestamp is carried by intent; used for user-state recency.
-        ts_utc = intent.ts_utc
+        sink_emit = self.sink.emit
+        intent_source = intent.intent_source
+        channel = intent.channel
+        payload = self._intent_payload(intent)
 
-        self._emit("session_intent", intent=intent)
+        sink_emit(
+            "session_intent",
+            intent_source=intent_source,
+            channel=channel,
+            payload=payload,
+        )
 
-        user_id, created = self._resolve_user(ts_utc=ts_utc)
+        # Canonical timestamp is carried by intent; used for user-state recency.
+        user_id, created = self._resolve_user(ts_utc=intent.ts_utc)
 
         if created:
-            self._emit("user_created", user_id=user_id, intent=intent)
+            sink_emit(
+                "user_created",
+                user_id=user_id,
+                intent_source=intent_source,
+                channel=channel,
+                payload=payload,
+            )
 
         session_id = self._new_session_id()
-        self._emit("session_start", user_id=user_id, session_id=session_id, intent=intent)
+        sink_emit(
+            "session_start",
+            user_id=user_id,
+            session_id=session_id,
+            intent_source=intent_source,
+            channel=channel or "direct",  # session-scoped events need a channel
+            payload=payload,
+        )
 
         self.session_runner.start_session(user_id=user_id, session_id=session_id, intent=intent)
 
     def _run_loop(self):
+        intents_get = self.intents.get
+        run_one = self._run_one
         while True:
-            intent: SessionIntent = yield self.intents.get()
-            self._run_one(intent)
+            intent: SessionIntent = yield intents_get()
+            run_one(intent)
@@ -49,10 +49,7 @@ class DummyUsers:
             self.users.append(uid)
             return _DummyUser(uid), True
 
-        idx = int(rng.random() * len(self.users))
-        if idx == len(self.users):
-            idx -= 1
-        return _DummyUser(self.users[idx]), False
+        return _DummyUser(self.users[rng.randrange(len(self.users))]), False
 
 
 @dataclass
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Protocol
+from datetime import datetime
+from typing import Any, Protocol, runtime_checkable
 
 from sim.features.events.types import EventsEmitter
 
@@ -10,6 +11,18 @@ class HasUserId(Protocol):
     user_id: str
 
 
+@runtime_checkable
+class IntentLike(Protocol):
+    """Attributes the resolver and session runners read off an intent (SessionIntent conforms)."""
+
+    intent_id: str | None
+    ts_utc: datetime
+    intent_source: str | None
+    channel: str | None
+    audience_id: str | None
+    payload: dict[str, Any] | None
+
+
 # Canonical event surface for the resolver
 EventSink = EventsEmitter
 
@@ -22,7 +35,7 @@ class SessionRunner(Protocol):
         *,
         user_id: str,
         session_id: str,
-        intent,
+        intent: IntentLike,
     ) -> Any: ...
 
 
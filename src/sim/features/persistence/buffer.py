@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+
+from .schema import EVENTS_COLUMNS
+
+_TS_IDX = EVENTS_COLUMNS.index("ts_utc")
+
+# NOT NULL numeric columns, drained straight into float64 arrays
+_FLOAT_COLUMNS = frozenset({"ts_utc", "sim_time_s"})
+
+
+class ColumnarEventBuffer:
+    """In-memory event batch handed to the adapter as columns.
+
+    Rows are held as tuples in EVENTS_COLUMNS order (one list append per event)
+    and transposed into columns once, at drain time: float64 arrays for the
+    NOT NULL numeric columns, lists for everything else. ts_utc is carried as UTC epoch seconds (float); datetimes are converted on entry.
+    """
+
+    __slots__ = ("_rows", "append")
+
+    def __init__(self) -> None:
+        self._rows: list[tuple[Any, ...]] = []
+        # append(values): bound list.append, so the per-event cost is a single C call
+        self.append = self._rows.append
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def append_row(self, row: Mapping[str, Any]) -> None:
+        get = row.get
+        values = [get(name) for name in EVENTS_COLUMNS]
+        values[_TS_IDX] = ts_to_epoch_s(values[_TS_IDX])
+        self._rows.append(tuple(values))
+
+    def drain(self) -> dict[str, Sequence[Any]]:
+        """Return the buffered batch as {column: values} and reset the buffer."""
+        rows = self._rows
+        self._rows = []
+        self.append = self._rows.append
+        if not rows:
+            return {name: [] for name in EVENTS_COLUMNS}
+
+        n = len(rows)
+        out: dict[str, Sequence[Any]] = {}
+        for name, col in zip(EVENTS_COLUMNS, zip(*rows, strict=True), strict=True):
+            if name in _FLOAT_COLUMNS:
+                out[name] = np.fromiter(col, dtype=np.float64, count=n)
+            else:
+                out[name] = list(col)
+        return out
+
+
+def ts_to_epoch_s(ts: Any) -> Any:
+    """datetime -> UTC epoch seconds; anything else (already epoch seconds) passes through."""
+    if isinstance(ts, datetime):
+        # naive datetimes are UTC by convention (matches the TIMESTAMP column)
+        return (ts if ts.tzinfo is not None else ts.replace(tzinfo=UTC)).timestamp()
+    return ts
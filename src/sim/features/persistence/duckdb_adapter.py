@@ -2,29 +2,76 @@ from __future__ import annotations
 
 import os
 import time
-from collections.abc import Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass
 
 import duckdb
+import numpy as np
 
-from .schema import EVENTS_TABLE_NAME, create_schema
+from .buffer import ts_to_epoch_s
+from .schema import EVENTS_COLUMNS, EVENTS_TABLE_NAME, create_indexes, create_table
 
+# write_columns binds its NumPy batch to a local named _events_batch (replacement scan).
+_INSERT_FROM_BATCH_SQL = (
+    f"INSERT INTO {EVENTS_TABLE_NAME} ({', '.join(EVENTS_COLUMNS)}) "
+    f"SELECT {', '.join(EVENTS_COLUMNS)} FROM _events_batch"
+)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class DuckDBWriteResult:
     num_events: int
     duration_ms: float
 
 
+def _epoch_s_to_datetime64_us(values: Sequence[float]) -> np.ndarray:
+    """UTC epoch seconds -> naive datetime64[us], rounded to the nearest microsecond.
+
+    Whole seconds and the fraction are split first so the microsecond rounding
+    (half-even) sees the exact fraction rather than a rounded t * 1e6 product.
+    WebsiteGraph.get_current_epoch returns the float nearest an exact microsecond,
+    so its stamps come back as exactly that microsecond.
+    """
+    t = np.asarray(values, dtype=np.float64)
+    whole = np.floor(t)
+    us = np.rint((t - whole) * 1e6)
+    return (whole.astype(np.int64) * 1_000_000 + us.astype(np.int64)).astype("datetime64[us]")
+
+
+def _sql_str(value: str) -> str:
+    """Quote a value as a SQL string literal (SET does not take bound parameters)."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
 class DuckDBAdapter:
     """
     DuckDB persistence adapter. Owns the connection and schema.
     """
 
-    def __init__(self, path: str, *, clean_slate: bool) -> None:
+    def __init__(
+        self,
+        path: str,
+        *,
+        clean_slate: bool,
+        event_types: Iterable[str] | None = None,
+        threads: int | None = None,
+        memory_limit: str | None = None,
+        checkpoint_threshold: str | None = None,
+        temp_directory: str | None = None,
+    ) -> None:
         self.path = path
         self.clean_slate = clean_slate
+        # known event types -> events.event_type as an ENUM (see schema.create_table)
+        self.event_types = frozenset(event_types) if event_types is not None else None
+        # Per-host tuning; None leaves DuckDB's default. A checkpoint_threshold above the
+        # run's WAL size moves checkpoint work from mid-run flushes to close().
+        self.threads = threads
+        self.memory_limit = memory_limit
+        self.checkpoint_threshold = checkpoint_threshold
+        self.temp_directory = temp_directory
         self._conn: duckdb.DuckDBPyConnection | None = None
+        # read-side connection, opened with the write one; reads never touch _conn
+        self._reader: duckdb.DuckDBPyConnection | None = None
 
     def open(self) -> None:
         if self.clean_slate and os.path.exists(self.path):
@@ -36,7 +83,30 @@ class DuckDBAdapter:
             os.makedirs(parent, exist_ok=True)
 
         self._conn = duckdb.connect(self.path)
-        create_schema(self._conn)
+        # Readers always ORDER BY (ts_utc, event_id), so bulk appends need not keep
+        # insertion order; this lets DuckDB stream large batches with less buffering.
+        self._conn.execute("SET preserve_insertion_order = false")
+        # Don't sample object columns to guess their type: they are all VARCHAR-castable,
+        # and the sampler fails once a column's sampled rows are all NULL (>= 2048 rows).
+        self._conn.execute("SET pandas_analyze_sample = 0")
+        self._apply_settings()
+        # Indexes are built once in close(); appends would otherwise update them per row.
+        create_table(self._conn, event_types=self.event_types)
+        # Opened here, on the opening thread, before any background writer starts using
+        # _conn; reader() hands out cursors of this connection only.
+        self._reader = self._conn.cursor()
+
+    def _apply_settings(self) -> None:
+        conn = self.conn
+        if self.threads is not None:
+            conn.execute(f"SET threads = {int(self.threads)}")
+        for name, value in (
+            ("memory_limit", self.memory_limit),
+            ("checkpoint_threshold", self.checkpoint_threshold),
+            ("temp_directory", self.temp_directory),
+        ):
+            if value is not None:
+                conn.execute(f"SET {name} = {_sql_str(value)}")
 
     @property
     def conn(self) -> duckdb.DuckDBPyConnection:
@@ -45,46 +115,92 @@ class DuckDBAdapter:
         return self._conn
 
     def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
         if self._conn is not None:
-            self._conn.close()
-            self._conn = None
+            try:
+                self.finalize_indexes()
+            finally:
+                self._conn.close()
+                self._conn = None
+
+    def finalize_indexes(self) -> None:
+        """Build the read-side indexes in one pass over the loaded table (idempotent)."""
+        create_indexes(self.conn)
 
     def write_events(self, rows: Sequence[tuple]) -> DuckDBWriteResult:
         """
-        Writes a batch of rows matching the events schema.
+        Writes a batch of rows (tuples in EVENTS_COLUMNS order, ts_utc as datetime).
+        Rows are transposed once and written through write_columns.
         Returns count and duration.
         """
         if not rows:
             return DuckDBWriteResult(num_events=0, duration_ms=0.0)
 
+        columns = dict(zip(EVENTS_COLUMNS, zip(*rows, strict=True), strict=True))
+        columns["ts_utc"] = [ts_to_epoch_s(ts) for ts in columns["ts_utc"]]
+        return self.write_columns(columns)
+
+    def write_columns(self, columns: Mapping[str, Sequence]) -> DuckDBWriteResult:
+        """
+        Writes a columnar batch (one equal-length sequence per EVENTS_COLUMNS name).
+        The columns are handed to DuckDB as NumPy arrays and loaded with a single
+        INSERT ... SELECT, so DuckDB scans them vectorized with no per-row binds.
+        ts_utc values are UTC epoch seconds; they are converted to TIMESTAMP once per batch.
+        Returns count and duration.
+        """
+        n = len(columns[EVENTS_COLUMNS[0]])
+        if n == 0:
+            return DuckDBWriteResult(num_events=0, duration_ms=0.0)
+
         t0 = time.perf_counter()
 
-        # Parameterized insert
-        self.conn.executemany(
-            f"""
-            INSERT INTO {EVENTS_TABLE_NAME} (
-                run_id, event_id,
-                ts_utc, sim_time_s,
-                user_id, session_id,
-                event_type,
-                intent_source, channel, page,
-                value_num, value_str,
-                payload_json
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            rows,
-        )
+        batch: dict[str, np.ndarray] = {}
+        for name in EVENTS_COLUMNS:
+            col = columns[name]
+            if name == "ts_utc":
+                batch[name] = _epoch_s_to_datetime64_us(col)
+            elif name == "sim_time_s":
+                batch[name] = np.asarray(col, dtype=np.float64)
+            else:
+                # object arrays keep None as NULL for the nullable text/double columns
+                batch[name] = np.asarray(col, dtype=object)
+
+        # DuckDB resolves the `_events_batch` table name to this local via a replacement
+        # scan; unlike register()/unregister() that adds no catalog entry per flush.
+        _events_batch = batch  # noqa: F841
+        self.conn.execute(_INSERT_FROM_BATCH_SQL)
 
         dt_ms = (time.perf_counter() - t0) * 1000.0
-        return DuckDBWriteResult(num_events=len(rows), duration_ms=dt_ms)
+        return DuckDBWriteResult(num_events=n, duration_ms=dt_ms)
+
+    def reader(self) -> duckdb.DuckDBPyConnection:
+        """
+        A new cursor on the adapter's single reader connection, for reads while ingest
+        continues.
+
+        A second duckdb.connect() on the same file fails while this adapter holds it
+        (read_only or not), so open() creates one reader connection as a cursor of the
+        write connection. Every reader() call returns a cursor on that shared reader
+        connection, so concurrent callers share it. None of them touch the write
+        connection, so a read does not serialize against an in-flight write, and each
+        query sees a consistent snapshot. Close the cursor when done.
+        """
+        if self._reader is None:
+            raise RuntimeError("DuckDBAdapter not opened. Call open() first.")
+        return self._reader.cursor()
 
     def count_events(self, run_id: str) -> int:
         """
         Convenience method for sanity checks/tests.
         """
-        res = self.conn.execute(
-            f"SELECT COUNT(*) FROM {EVENTS_TABLE_NAME} WHERE run_id = ?",
-            [run_id],
-        ).fetchone()
+        cur = self.reader()
+        try:
+            res = cur.execute(
+                f"SELECT COUNT(*) FROM {EVENTS_TABLE_NAME} WHERE run_id = ?",
+                [run_id],
+            ).fetchone()
+        finally:
+            cur.close()
         return int(res[0]) if res else 0
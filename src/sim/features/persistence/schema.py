@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 EVENTS_TABLE_NAME = "events"
 
-EVENTS_DDL = f"""
-CREATE TABLE IF NOT EXISTS {EVENTS_TABLE_NAME} (
+# Optional ENUM for events.event_type; DuckDB stores it as small dictionary codes.
+EVENT_TYPE_ENUM_NAME = "event_type_t"
+
+_EVENTS_DDL_TEMPLATE = """
+CREATE TABLE IF NOT EXISTS {table} (
     run_id TEXT NOT NULL,
     event_id TEXT NOT NULL,
 
@@ -13,7 +18,7 @@ CREATE TABLE IF NOT EXISTS {EVENTS_TABLE_NAME} (
     user_id TEXT,
     session_id TEXT,
 
-    event_type TEXT NOT NULL,
+    event_type {event_type_sql} NOT NULL,
 
     intent_source TEXT,
     channel TEXT,
@@ -26,6 +31,25 @@ CREATE TABLE IF NOT EXISTS {EVENTS_TABLE_NAME} (
 );
 """
 
+EVENTS_DDL = _EVENTS_DDL_TEMPLATE.format(table=EVENTS_TABLE_NAME, event_type_sql="TEXT")
+
+# Column order shared by the row and columnar write paths.
+EVENTS_COLUMNS: tuple[str, ...] = (
+    "run_id",
+    "event_id",
+    "ts_utc",
+    "sim_time_s",
+    "user_id",
+    "session_id",
+    "event_type",
+    "intent_source",
+    "channel",
+    "page",
+    "value_num",
+    "value_str",
+    "payload_json",
+)
+
 # Optional but helpful for query speed
 EVENTS_INDEXES = [
     f"CREATE INDEX IF NOT EXISTS idx_events_run_id ON {EVENTS_TABLE_NAME}(run_id);",
@@ -34,10 +58,35 @@ EVENTS_INDEXES = [
 ]
 
 
-def create_schema(conn) -> None:
+def create_table(conn, *, event_types: Iterable[str] | None = None) -> None:
     """
-    Create tables/indexes. No migrations. Safe to call per run.
+    Create the events table only. No migrations. Safe to call per run.
+
+    With event_types, event_type is declared as an ENUM of exactly those values, so
+    writing any other event_type fails. An existing table/type is left as is.
+    """
+    if not event_types:
+        conn.execute(EVENTS_DDL)
+        return
+
+    values = ", ".join("'" + t.replace("'", "''") + "'" for t in sorted(event_types))
+    conn.execute(f"CREATE TYPE IF NOT EXISTS {EVENT_TYPE_ENUM_NAME} AS ENUM ({values})")
+    conn.execute(
+        _EVENTS_DDL_TEMPLATE.format(table=EVENTS_TABLE_NAME, event_type_sql=EVENT_TYPE_ENUM_NAME)
+    )
+
+
+def create_indexes(conn) -> None:
+    """
+    Create read-side indexes. Built after ingest so appends don't maintain them per row.
     """
-    conn.execute(EVENTS_DDL)
     for ddl in EVENTS_INDEXES:
         conn.execute(ddl)
+
+
+def create_schema(conn) -> None:
+    """
+    Create tables/indexes. No migrations. Safe to call per run.
+    """
+    create_table(conn)
+    create_indexes(conn)
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
-import json
+import logging
+import queue
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
 from sim.core.logging import get_logger  # adjust if your logger lives elsewhere
+from sim.features.events.schema import json_dumps
 
+from .buffer import ColumnarEventBuffer, ts_to_epoch_s
 from .duckdb_adapter import DuckDBAdapter
 
+# Count-based batches below this size spend most of each flush on fixed overhead.
+_SMALL_BATCH_WARN_EVENTS = 1_000
 
-@dataclass(frozen=True)
+# Drained batches the background writer may hold before flush() blocks the sim.
+_WRITER_QUEUE_MAXSIZE = 4
+
+
+@dataclass(frozen=True, slots=True)
 class Event:
     """Legacy in-memory event type (kept for backwards compatibility)."""
 
@@ -40,6 +51,28 @@ class PersistenceService:
 
     - Hot: buffer in memory
     - Cold: DuckDB
+
+    Each flush has a fixed DuckDB cost of a few ms, so batches of 10k+ events amortize
+    it well; below ~1k the fixed cost dominates and a warning is logged. The buffer
+    holds at most every_n_events rows (roughly every_n_events x a few hundred bytes)
+    between flushes; or_every_seconds bounds how long they wait in sim time.
+
+    With min_flush_interval_s > 0, a count-triggered flush that would follow the
+    previous flush within that many wall-clock seconds is deferred until the buffer
+    reaches 2 x every_n_events, so bursts coalesce into fewer, larger batches.
+    Timer, immediate and shutdown flushes are never deferred.
+
+    With background=True, flush() only drains the buffer and hands the batch to a
+    single writer thread, so DuckDB writes overlap with simulation. Batches are
+    written in order; a writer error is re-raised on the next flush() or close().
+    The flush interval above is measured from when the writer finished the last
+    batch, not from when it was queued.
+
+    Reads: while the writer runs, the adapter's write connection belongs to it.
+    Read through adapter.reader() / adapter.count_events(), which use a separate
+    connection opened before the writer starts, and call wait_for_writes() first to
+    see every batch flushed so far. close() stops the writer before the adapter
+    builds its indexes and closes the connection.
     """
 
     def __init__(
@@ -48,17 +81,36 @@ class PersistenceService:
         adapter: DuckDBAdapter,
         every_n_events: int,
         or_every_seconds: float,
+        background: bool = False,
+        min_flush_interval_s: float = 0.0,
     ) -> None:
         self.adapter = adapter
         self.every_n_events = int(every_n_events)
         self.or_every_seconds = float(or_every_seconds)
+        self.background = bool(background)
+        self.min_flush_interval_s = float(min_flush_interval_s)
 
-        # Internal buffer holds tuples already shaped for DuckDBAdapter.write_events(...)
-        self._buf_rows: list[tuple] = []
+        self._buf = ColumnarEventBuffer()
         self._logger = get_logger(__name__)
 
+        if 0 < self.every_n_events < _SMALL_BATCH_WARN_EVENTS:
+            self._logger.warning(
+                "small flush batch size hurts DuckDB throughput",
+                extra={
+                    "every_n_events": self.every_n_events,
+                    "recommended_min": _SMALL_BATCH_WARN_EVENTS,
+                },
+            )
+
         self._is_open = False
         self._periodic_proc_started = False
+        # perf_counter() once the last batch was written; set by _write (on the writer
+        # thread when background=True)
+        self._last_flush_end = float("-inf")
+
+        self._queue: queue.Queue[tuple[dict[str, Any], str] | None] | None = None
+        self._writer: threading.Thread | None = None
+        self._writer_error: BaseException | None = None
 
     def open(self) -> None:
         if self._is_open:
@@ -66,6 +118,13 @@ class PersistenceService:
         self.adapter.open()
         self._is_open = True
 
+        if self.background:
+            self._queue = queue.Queue(maxsize=_WRITER_QUEUE_MAXSIZE)
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="persistence-writer", daemon=True
+            )
+            self._writer.start()
+
     # ------------------------------------------------------------------
     # Canonical API used by sim.features.events
     # ------------------------------------------------------------------
@@ -74,26 +133,93 @@ class PersistenceService:
         if not self._is_open:
             raise RuntimeError("PersistenceService not open. Call open() during bootstrap.")
 
-        self._buf_rows.append(self._rowdict_to_tuple(row))
+        self._buf.append_row(row)
+
+        if self.every_n_events > 0 and len(self._buf) >= self.every_n_events:
+            self._count_flush()
+
+    def append_values(self, values: tuple[Any, ...]) -> None:
+        """Append one event given as a tuple in EVENTS_COLUMNS order (no dict round-trip).
+
+        ts_utc must be UTC epoch seconds; append(row) also accepts a datetime.
+        """
+        if not self._is_open:
+            raise RuntimeError("PersistenceService not open. Call open() during bootstrap.")
+
+        buf = self._buf
+        buf.append(values)
+
+        if self.every_n_events > 0 and len(buf) >= self.every_n_events:
+            self._count_flush()
+
+    def append_immediate(self, row: dict[str, Any]) -> None:
+        """Append a row and flush the buffer right away, ignoring the count threshold.
+
+        Used for run bookends so they are durable even if the run crashes before the
+        next batch flush. The row goes through the same buffer, so it lands after
+        everything already buffered and insertion order matches event order.
+        """
+        if not self._is_open:
+            raise RuntimeError("PersistenceService not open. Call open() during bootstrap.")
+
+        self._buf.append_row(row)
+        self.flush(reason="immediate")
+        self.wait_for_writes()
 
-        if self.every_n_events > 0 and len(self._buf_rows) >= self.every_n_events:
-            self.flush(reason="count")
+    def wait_for_writes(self) -> None:
+        """Block until every flushed batch is written (no-op without background)."""
+        if self._queue is not None:
+            self._queue.join()
+        self._raise_writer_error()
 
     # ------------------------------------------------------------------
     # Legacy API (kept so older adapters/tests don't immediately break)
     # ------------------------------------------------------------------
     def emit(self, e: Event) -> None:
-        self.append(self._event_to_rowdict(e))
+        self.append_values(self._event_to_values(e))
 
     def flush(self, *, reason: str) -> None:
-        if not self._buf_rows:
+        self._raise_writer_error()
+        if not len(self._buf):
+            return
+
+        if self._queue is not None:
+            self._queue.put((self._buf.drain(), reason))
+        else:
+            self._write(self._buf.drain(), reason)
+
+    def _count_flush(self) -> None:
+        """Count threshold reached: flush now unless this is a burst worth coalescing."""
+        if (
+            self.min_flush_interval_s > 0
+            and len(self._buf) < 2 * self.every_n_events
+            and time.perf_counter() - self._last_flush_end < self.min_flush_interval_s
+        ):
             return
+        self.flush(reason="count")
 
-        rows = list(self._buf_rows)
-        self._buf_rows.clear()
+    def close(self) -> None:
+        try:
+            try:
+                self.flush(reason="shutdown")
+            finally:
+                # writer joined before adapter.close() touches the connection again
+                self._stop_writer()
+            self._raise_writer_error()
+        finally:
+            self.adapter.close()
+            self._is_open = False
 
-        result = self.adapter.write_events(rows)
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def _write(self, columns: dict[str, Any], reason: str) -> None:
+        result = self.adapter.write_columns(columns)
+        self._last_flush_end = time.perf_counter()
 
+        # runs on the writer thread when background=True, off the sim thread
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
         self._logger.info(
             "flush",
             extra={
@@ -105,10 +231,34 @@ class PersistenceService:
             },
         )
 
-    def close(self) -> None:
-        self.flush(reason="shutdown")
-        self.adapter.close()
-        self._is_open = False
+    def _writer_loop(self) -> None:
+        q = self._queue
+        assert q is not None
+        while True:
+            item = q.get()
+            try:
+                if item is None:
+                    return
+                if self._writer_error is None:
+                    self._write(*item)
+            except BaseException as exc:  # surfaced on the sim thread
+                self._writer_error = exc
+            finally:
+                q.task_done()
+
+    def _stop_writer(self) -> None:
+        if self._writer is None or self._queue is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        self._queue = None
+
+    def _raise_writer_error(self) -> None:
+        err = self._writer_error
+        if err is not None:
+            self._writer_error = None
+            raise RuntimeError("background flush failed") from err
 
     def start_periodic_flush(self, env) -> None:
         if self._periodic_proc_started:
@@ -125,42 +275,24 @@ class PersistenceService:
     # Row shaping
     # ------------------------------------------------------------------
     @staticmethod
-    def _event_to_rowdict(e: Event) -> dict[str, Any]:
-        return {
-            "run_id": e.run_id,
-            "event_id": e.event_id,
-            "ts_utc": e.ts_utc,
-            "sim_time_s": float(e.sim_time_s),
-            "user_id": e.user_id,
-            "session_id": e.session_id,
-            "event_type": e.event_type,
-            "intent_source": e.intent_source,
-            "channel": e.channel,
-            "page": e.page,
-            "value_num": e.value_num,
-            "value_str": e.value_str,
-            "payload_json": json.dumps(
-                e.payload, sort_keys=True, separators=(",", ":"), default=str
-            )
-            if e.payload
-            else None,
-        }
+    def _event_to_values(e: Event) -> tuple[Any, ...]:
+        """Event -> values tuple in EVENTS_COLUMNS order (ts_utc as epoch seconds).
 
-    @staticmethod
-    def _rowdict_to_tuple(row: dict[str, Any]) -> tuple:
-        # DuckDBAdapter.write_events expects this exact order.
+        Called from emit(), so the payload is serialized once per event as it arrives
+        rather than in a burst at flush time.
+        """
         return (
-            row.get("run_id"),
-            row.get("event_id"),
-            row.get("ts_utc"),
-            float(row.get("sim_time_s")) if row.get("sim_time_s") is not None else None,
-            row.get("user_id"),
-            row.get("session_id"),
-            row.get("event_type"),
-            row.get("intent_source"),
-            row.get("channel"),
-            row.get("page"),
-            row.get("value_num"),
-            row.get("value_str"),
-            row.get("payload_json"),
+            e.run_id,
+            e.event_id,
+            ts_to_epoch_s(e.ts_utc),
+            float(e.sim_time_s),
+            e.user_id,
+            e.session_id,
+            e.event_type,
+            e.intent_source,
+            e.channel,
+            e.page,
+            e.value_num,
+            e.value_str,
+            json_dumps(e.payload) if e.payload else None,
         )
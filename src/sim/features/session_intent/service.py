@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
@@ -13,21 +14,28 @@ from .types import SessionIntent
 
 @dataclass(slots=True)
 class SessionIntentService:
+    """FIFO intent bus between arrivals/channels (producers) and the resolver (consumer).
+
+    Unbounded buses (capacity=None) keep intents in a deque and hand them straight to
+    a waiting get(): one event per delivered intent instead of a Store put + get pair.
+    Bounded buses keep simpy.Store so producers can block on a full queue.
+    """
+
     env: simpy.Environment
     ids: IdsService
     capacity: int | None = None
 
-    _store: simpy.Store = field(init=False, repr=False)
+    _store: simpy.Store | None = field(init=False, repr=False, default=None)
+    _items: deque[SessionIntent] = field(init=False, repr=False, default_factory=deque)
+    _getters: deque[simpy.events.Event] = field(init=False, repr=False, default_factory=deque)
 
     def __post_init__(self) -> None:
-        # SimPy does NOT accept None for capacity; omit to get infinite capacity.
-        if self.capacity is None:
-            self._store = simpy.Store(self.env)
-        else:
+        if self.capacity is not None:
             self._store = simpy.Store(self.env, capacity=self.capacity)
 
     @property
-    def store(self) -> simpy.Store:
+    def store(self) -> simpy.Store | None:
+        """Backing Store for bounded buses; None when capacity is unbounded."""
         return self._store
 
     def build_intent(
@@ -43,7 +51,7 @@ class SessionIntentService:
         return SessionIntent(
             intent_id=intent_id,
             ts_utc=ts_utc,
-            sim_time_s=float(self.env.now),
+            sim_time_s=self.env.now,
             intent_source=intent_source,
             channel=channel,
             audience_id=audience_id,
@@ -51,7 +59,22 @@ class SessionIntentService:
         )
 
     def publish(self, intent: SessionIntent) -> simpy.events.Event:
-        return self._store.put(intent)
+        if self._store is not None:
+            return self._store.put(intent)
+        # scheduled ahead of the getter's wake-up, matching Store.put ordering
+        done = self.env.event().succeed()
+        self.publish_nowait(intent)
+        return done
+
+    def publish_nowait(self, intent: SessionIntent) -> None:
+        """publish() for producers that never wait on the put (no event when unbounded)."""
+        if self._store is not None:
+            self._store.put(intent)
+            return
+        if self._getters:
+            self._getters.popleft().succeed(intent)
+        else:
+            self._items.append(intent)
 
     def publish_new(
         self,
@@ -72,7 +95,16 @@ class SessionIntentService:
         return self.publish(intent)
 
     def get(self) -> simpy.events.Event:
-        return self._store.get()
+        if self._store is not None:
+            return self._store.get()
+        ev = self.env.event()
+        if self._items:
+            ev.succeed(self._items.popleft())
+        else:
+            self._getters.append(ev)
+        return ev
 
     def size(self) -> int:
-        return len(self._store.items)
+        if self._store is not None:
+            return len(self._store.items)
+        return len(self._items)
@@ -80,3 +80,32 @@ def test_capacity_blocks_if_full() -> None:
 
     env.run(until=2.0)
     assert done["second_put_done"] is True
+
+
+def test_unbounded_bus_delivers_in_order_to_waiting_consumer() -> None:
+    from sim.features.session_intent.service import SessionIntentService
+
+    env = simpy.Environment()
+    bus = SessionIntentService(env=env, ids=DummyIds(), capacity=None)
+    t0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+    got: list[tuple[float, str]] = []
+
+    def consumer():
+        while True:
+            intent = yield bus.get()
+            got.append((env.now, intent.intent_id))
+
+    def producer():
+        yield env.timeout(1)
+        bus.publish_nowait(bus.build_intent(ts_utc=t0, intent_source="baseline"))
+        bus.publish_nowait(bus.build_intent(ts_utc=t0, intent_source="baseline"))
+        yield env.timeout(1)
+        yield bus.publish_new(ts_utc=t0, intent_source="baseline")
+
+    env.process(consumer())
+    env.process(producer())
+    env.run(until=5)
+
+    assert got == [(1, "intent_000001"), (1, "intent_000002"), (2, "intent_000003")]
+    assert bus.size() == 0
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import inspect
 import math
+import sys
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
@@ -46,27 +49,79 @@ class SessionsConfig:
 # ----------------------------
 
 
-def _sample_inter_page_delay_s(cfg: InterPageTimeConfig, rng: Any) -> float:
+# Exponential delays drawn per NumPy call when the RNG exposes numpy_generator().
+_EXPO_BATCH = 4096
+
+
+def _inter_page_delay_sampler(cfg: InterPageTimeConfig, rng: Any) -> Callable[[], float]:
+    """Resolve the distribution and RNG capabilities once; return a no-arg delay sampler.
+
+    Exponential delays come from the RNG's NumPy generator when it has one (its stream
+    is separate from the scalar draws), else from expovariate, else from random().
+    """
     dist = (cfg.dist or "fixed").lower().strip()
 
     if dist == "fixed":
-        return float(cfg.fixed_seconds)
+        fixed = float(cfg.fixed_seconds)
+        return lambda: fixed
 
     if dist == "exponential":
         mean = float(cfg.mean_seconds)
         if mean <= 0:
-            return 0.0
+            return lambda: 0.0
+
+        numpy_generator = getattr(rng, "numpy_generator", None)
+        if numpy_generator is not None:
+            # pre-draw in batches from the NumPy generator (ziggurat, no log per draw)
+            gen = numpy_generator()
+            buf: list[float] = []
+
+            def sample_batched() -> float:
+                if not buf:
+                    buf.extend((gen.standard_exponential(_EXPO_BATCH) * mean).tolist()[::-1])
+                return buf.pop()
+
+            return sample_batched
 
         # expovariate expects lambda = 1/mean
-        if not hasattr(rng, "expovariate"):
-            # fallback using inverse-CDF with rng.random()
-            u = float(rng.random())
-            u = min(max(u, 1e-12), 1.0 - 1e-12)
-            return -math.log(1.0 - u) * mean
+        expovariate = getattr(rng, "expovariate", None)
+        if expovariate is None:
+            random = rng.random
+
+            def sample() -> float:
+                # inverse-CDF fallback: U and 1 - U are both uniform, so -log(U) * mean
+                # needs no subtraction; `or` only guards the u == 0.0 draw.
+                return -math.log(random() or 1e-300) * mean
 
-        return float(rng.expovariate(1.0 / mean))
+            return sample
 
-    raise ValueError(f"Unsupported sessions.inter_page_time.dist: {cfg.dist!r}")
+        rate = 1.0 / mean
+        return lambda: expovariate(rate)
+
+    def unsupported() -> float:
+        raise ValueError(f"Unsupported sessions.inter_page_time.dist: {cfg.dist!r}")
+
+    return unsupported
+
+
+def _bind_next_page(graph: WebsiteGraph, rng: Any) -> Callable[[str], str | None]:
+    """Return next_page(current), passing rng only if the graph's next_page accepts it.
+
+    The signature is probed once, so a TypeError raised inside next_page propagates
+    instead of being mistaken for an arity mismatch.
+    """
+    next_page = graph.next_page
+    params = inspect.signature(next_page).parameters.values()
+    takes_rng = any(p.kind is inspect.Parameter.VAR_POSITIONAL for p in params) or (
+        sum(
+            p.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+            for p in params
+        )
+        >= 2
+    )
+    if takes_rng:
+        return lambda current: next_page(current, rng)
+    return next_page
 
 
 # ----------------------------
@@ -102,6 +157,14 @@ class SessionsService:
         self.rng = rng
         self.events = events
         self.cfg = cfg
+        # dist + rng probing done once, not per page step
+        self._sample_delay_s = _inter_page_delay_sampler(cfg.inter_page_time, rng)
+        self._timeout_s = float(cfg.inactivity_timeout_minutes) * 60.0
+        self._next_page = _bind_next_page(graph, rng)
+        # one int compare per step; sys.maxsize stands in for "no cap"
+        self._step_cap = int(cfg.max_steps) if cfg.max_steps is not None else sys.maxsize
+        # page name -> base dropoff_p; pages are fixed once the graph is built
+        self._dropoff_by_page: dict[str, float] = {}
 
     def spawn(
         self,
@@ -135,30 +198,9 @@ class SessionsService:
             )
         )
 
-    def _emit(
-        self,
-        *,
-        event_type: str,
-        user_id: str,
-        session_id: str,
-        intent_source: str | None,
-        channel: str,
-        page: str | None = None,
-        value_num: float | None = None,
-        value_str: str | None = None,
-        payload: dict[str, Any] | None = None,
-    ) -> None:
-        self.events.emit(
-            event_type,
-            user_id=user_id,
-            session_id=session_id,
-            intent_source=intent_source,
-            channel=channel,
-            page=page,
-            value_num=value_num,
-            value_str=value_str,
-            payload=payload,
-        )
+    def _page_dropoff_p(self, name: str) -> float:
+        page_obj = self.graph.get_page(name)
+        return float(getattr(page_obj, "dropoff_p", 0.0)) if page_obj is not None else 0.0
 
     def _run_session(
         self,
@@ -173,11 +215,28 @@ class SessionsService:
         dropoff_multiplier: float,
         conversion_logit_shift: float,
     ):
-        max_steps = self.cfg.max_steps
-        timeout_s = float(self.cfg.inactivity_timeout_minutes) * 60.0
+        step_cap = self._step_cap
+        timeout_s = self._timeout_s
+
+        # Bound once per session; every event below is a direct emit call (no wrapper).
+        emit = self.events.emit
+        random = self.rng.random
+        next_page = self._next_page
+        dropoff_by_page = self._dropoff_by_page
+        dropoff_mult = float(dropoff_multiplier)
+        sample_delay_s = self._sample_delay_s
+
+        # Propensity and logit shift are fixed for the session, so is p(convert).
+        p_conv: float | None = None
+        if conversion is not None:
+            # probability() coerces its inputs and returns a float
+            p_conv = conversion.probability(
+                propensity=user_propensity if user_propensity is not None else 0.0,
+                logit_shift=conversion_logit_shift,
+            )
 
-        self._emit(
-            event_type="session_start",
+        emit(
+            "session_start",
             user_id=user_id,
             session_id=session_id,
             intent_source=intent_source,
@@ -185,13 +244,14 @@ class SessionsService:
             page=entry_page,
         )
 
-        current: str | None = entry_page
+        current = entry_page
         steps = 0
 
-        while current is not None:
+        # Every exit path sets end_reason and breaks; session_end is emitted once below.
+        while True:
             # page view (entry page is counted as a view)
-            self._emit(
-                event_type="page_view",
+            emit(
+                "page_view",
                 user_id=user_id,
                 session_id=session_id,
                 intent_source=intent_source,
@@ -201,26 +261,19 @@ class SessionsService:
             steps += 1
 
             # max steps cap
-            if max_steps is not None and steps >= int(max_steps):
-                self._emit(
-                    event_type="session_end",
-                    user_id=user_id,
-                    session_id=session_id,
-                    intent_source=intent_source,
-                    channel=channel,
-                    page=current,
-                    value_str="max_steps",
-                )
-                return
+            if steps >= step_cap:
+                end_reason = "max_steps"
+                break
 
             # page-level dropoff
-            page_obj = self.graph.get_page(current)
-            drop_p = float(getattr(page_obj, "dropoff_p", 0.0)) if page_obj is not None else 0.0
-            drop_p = max(0.0, min(1.0, drop_p * float(dropoff_multiplier)))
-
-            if self.rng.random() < drop_p:
-                self._emit(
-                    event_type="drop_off",
+            base_p = dropoff_by_page.get(current)
+            if base_p is None:
+                base_p = dropoff_by_page[current] = self._page_dropoff_p(current)
+            drop_p = max(0.0, min(1.0, base_p * dropoff_mult))
+
+            if random() < drop_p:
+                emit(
+                    "drop_off",
                     user_id=user_id,
                     session_id=session_id,
                     intent_source=intent_source,
@@ -228,68 +281,43 @@ class SessionsService:
                     page=current,
                     value_num=drop_p,
                 )
-                self._emit(
-                    event_type="session_end",
+                end_reason = "drop_off"
+                break
+
+            # conversion check (optional); same single draw as should_convert
+            if p_conv is not None and random() < p_conv:
+                emit(
+                    "conversion",
                     user_id=user_id,
                     session_id=session_id,
                     intent_source=intent_source,
                     channel=channel,
                     page=current,
-                    value_str="drop_off",
+                    value_num=p_conv,
                 )
-                return
-
-            # conversion check (optional)
-            if conversion is not None:
-                did_convert, p_conv = conversion.should_convert(
-                    rng=self.rng,
-                    propensity=float(user_propensity) if user_propensity is not None else 0.0,
-                    logit_shift=float(conversion_logit_shift),
-                )
-
-                if did_convert:
-                    self._emit(
-                        event_type="conversion",
-                        user_id=user_id,
-                        session_id=session_id,
-                        intent_source=intent_source,
-                        channel=channel,
-                        page=current,
-                        value_num=float(p_conv),
-                    )
 
             # select next page
-            try:
-                nxt = self.graph.next_page(current, self.rng)
-            except TypeError:
-                nxt = self.graph.next_page(current)
-
+            nxt = next_page(current)
             if nxt is None:
-                self._emit(
-                    event_type="session_end",
-                    user_id=user_id,
-                    session_id=session_id,
-                    intent_source=intent_source,
-                    channel=channel,
-                    page=current,
-                    value_str="no_next_page",
-                )
-                return
+                end_reason = "no_next_page"
+                break
 
             # delay to next interaction
-            delay_s = float(_sample_inter_page_delay_s(self.cfg.inter_page_time, self.rng))
+            delay_s = sample_delay_s()
             if delay_s > timeout_s:
                 yield self.env.timeout(timeout_s)
-                self._emit(
-                    event_type="session_end",
-                    user_id=user_id,
-                    session_id=session_id,
-                    intent_source=intent_source,
-                    channel=channel,
-                    page=current,
-                    value_str="timeout",
-                )
-                return
+                end_reason = "timeout"
+                break
 
             yield self.env.timeout(delay_s)
             current = nxt
+
+        emit(
+            "session_end",
+            user_id=user_id,
+            session_id=session_id,
+            intent_source=intent_source,
+            channel=channel,
+            page=current,
+            value_str=end_reason,
+        )
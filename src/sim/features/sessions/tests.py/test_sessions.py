@@ -31,14 +31,13 @@ class DummyRng:
 
     def __init__(self, values: list[float]) -> None:
         self.values = list(values)
-        self.idx = 0
+        self._next = iter([float(v) for v in self.values]).__next__
 
     def random(self) -> float:
-        if self.idx >= len(self.values):
+        try:
+            return self._next()
+        except StopIteration:
             return 0.999
-        v = float(self.values[self.idx])
-        self.idx += 1
-        return v
 
     def expovariate(self, lambd: float) -> float:
         return 0.0
@@ -55,6 +54,11 @@ class DummyGraph:
         self.env = env
         self.pages = pages
         self.start_dt = start_dt
+        # deterministic: max-weight target per page (first on ties), resolved once
+        self._argmax = {
+            name: max(p.transitions, key=lambda t: t[1])[0] if p.transitions else None
+            for name, p in pages.items()
+        }
 
     def get_current_time(self) -> datetime:
         return self.start_dt + timedelta(seconds=float(self.env.now))
@@ -63,11 +67,7 @@ class DummyGraph:
         return self.pages.get(name)
 
     def next_page(self, current_name: str, rng: Any) -> str | None:
-        page = self.get_page(current_name)
-        if not page or not page.transitions:
-            return None
-        # deterministic: pick max weight
-        return sorted(page.transitions, key=lambda t: t[1], reverse=True)[0][0]
+        return self._argmax.get(current_name)
 
 
 # ----------------------------
@@ -196,3 +196,68 @@ def test_session_conversion_emits_conversion() -> None:
 
     types = [r["event_type"] for r in events.rows]
     assert "conversion" in types
+
+
+def test_exponential_delay_fallback_uses_inverse_cdf_without_expovariate() -> None:
+    import math
+
+    from sim.features.sessions.service import _inter_page_delay_sampler
+
+    class RandomOnlyRng:
+        def __init__(self, values: list[float]) -> None:
+            self.values = list(values)
+
+        def random(self) -> float:
+            return self.values.pop(0)
+
+    sample = _inter_page_delay_sampler(
+        InterPageTimeConfig(dist="exponential", mean_seconds=10.0), RandomOnlyRng([0.5, 0.0])
+    )
+    assert math.isclose(sample(), 10.0 * math.log(2.0))
+    assert math.isfinite(sample())  # u == 0.0 is guarded
+
+
+def test_exponential_delay_uses_batched_numpy_draws_when_available() -> None:
+    import numpy as np
+
+    from sim.features.sessions.service import _inter_page_delay_sampler
+
+    class NumpyRng:
+        def __init__(self, seed: int) -> None:
+            self._gen = np.random.default_rng(seed)
+
+        def numpy_generator(self) -> np.random.Generator:
+            return self._gen
+
+    sample = _inter_page_delay_sampler(
+        InterPageTimeConfig(dist="exponential", mean_seconds=10.0), NumpyRng(7)
+    )
+    expected = np.random.default_rng(7).standard_exponential(3) * 10.0
+    assert [sample() for _ in range(3)] == expected.tolist()
+
+
+def test_next_page_binding_passes_rng_only_when_accepted() -> None:
+    import pytest
+
+    from sim.features.sessions.service import _bind_next_page
+
+    sentinel_rng = object()
+
+    class OneArgGraph:
+        def next_page(self, current_name: str) -> str | None:
+            return f"{current_name}:no_rng"
+
+    class TwoArgGraph:
+        def next_page(self, current_name: str, rng: Any) -> str | None:
+            return f"{current_name}:rng" if rng is sentinel_rng else None
+
+    class RaisingGraph:
+        def next_page(self, current_name: str) -> str | None:
+            raise TypeError("bug inside next_page")
+
+    assert _bind_next_page(OneArgGraph(), sentinel_rng)("home") == "home:no_rng"
+    assert _bind_next_page(TwoArgGraph(), sentinel_rng)("home") == "home:rng"
+
+    # no longer swallowed as a signature mismatch
+    with pytest.raises(TypeError, match="bug inside next_page"):
+        _bind_next_page(RaisingGraph(), sentinel_rng)("home")
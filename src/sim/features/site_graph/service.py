@@ -1,6 +1,7 @@
 # src/sim/features/site_graph/service.py
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
@@ -59,7 +60,10 @@ class SiteGraphFactory:
             transitions_raw = page_cfg.get("transitions") or []
             transitions = SiteGraphFactory._parse_transitions(page_name, transitions_raw)
 
-            pages[page_name] = Page(name=page_name, dropoff_p=dropoff_p_f, transitions=transitions)
+            # Interned names: the strings next_page returns are the page-dict keys themselves,
+            # so per-step lookups keyed by them match on identity.
+            name = sys.intern(page_name)
+            pages[name] = Page(name=name, dropoff_p=dropoff_p_f, transitions=transitions)
 
         # Second pass: optionally validate transition targets exist
         if strict:
@@ -73,9 +77,9 @@ class SiteGraphFactory:
         return pages
 
     @staticmethod
-    def _parse_transitions(page_name: str, transitions_raw: Any) -> list[tuple[str, float]]:
+    def _parse_transitions(page_name: str, transitions_raw: Any) -> tuple[tuple[str, float], ...]:
         if transitions_raw is None:
-            return []
+            return ()
 
         if not isinstance(transitions_raw, list):
             raise TypeError(f"site_graph.pages.{page_name}.transitions must be a list")
@@ -106,6 +110,6 @@ class SiteGraphFactory:
                     f"site_graph.pages.{page_name}.transitions[{idx}] weight must be >= 0"
                 )
 
-            out.append((target, w))
+            out.append((sys.intern(target), w))
 
-        return out
+        return tuple(out)
@@ -41,10 +41,29 @@ def test_factory_builds_pages_and_fields() -> None:
 
     assert g.get_page("home") is not None
     assert g.get_page("home").dropoff_p == pytest.approx(0.25)  # type: ignore
-    assert g.get_page("home").transitions == [("product", 0.55), ("pricing", 0.25)]  # type: ignore
+    assert g.get_page("home").transitions == (("product", 0.55), ("pricing", 0.25))  # type: ignore
     assert g.get_page("missing") is None
 
 
+def test_next_page_matches_normalized_weights_draw() -> None:
+    env = DummyEnv()
+    start_dt = datetime(2026, 1, 1, tzinfo=UTC)
+    g = SiteGraphFactory().build(
+        env=env, cfg_site_graph=_cfg_basic(), start_dt=start_dt, rng=RNG(seed=7)
+    )
+
+    home = g.get_page("home")
+    assert home.targets == ("product", "pricing")  # type: ignore
+    assert home.cum_weights[-1] == pytest.approx(1.0)  # type: ignore
+
+    # Same picks as choices() over the per-call normalized weights.
+    ref = RNG(seed=7)
+    names = ["product", "pricing"]
+    probs = [0.55 / 0.8, 0.25 / 0.8]
+    for _ in range(200):
+        assert g.next_page("home") == ref.choices(names, weights=probs, k=1)[0]
+
+
 def test_strict_mode_unknown_transition_target_raises() -> None:
     env = DummyEnv()
     rng = RNG(seed=1)
@@ -158,3 +177,59 @@ def test_get_current_time_is_utc_and_matches_env_now_seconds() -> None:
     env.now = 90.5
     t1 = g.get_current_time()
     assert t1 == t0 + timedelta(seconds=90.5)
+
+
+def test_transition_targets_are_the_page_keys() -> None:
+    env = DummyEnv()
+    start_dt = datetime(2026, 1, 1, tzinfo=UTC)
+    g = SiteGraphFactory().build(
+        env=env, cfg_site_graph=_cfg_basic(), start_dt=start_dt, rng=RNG(seed=1)
+    )
+
+    keys = {name: name for name in g.pages}
+    for target in g.get_page("home").targets:  # type: ignore
+        assert target is keys[target]
+
+
+def test_single_positive_target_is_returned_without_a_draw() -> None:
+    env = DummyEnv()
+    start_dt = datetime(2026, 1, 1, tzinfo=UTC)
+    rng = RNG(seed=3)
+    cfg = {
+        "pages": {
+            "home": {"dropoff_p": 0.0, "transitions": [["a", 0.0], ["b", 2.0]]},
+            "a": {"dropoff_p": 0.0, "transitions": []},
+            "b": {"dropoff_p": 0.0, "transitions": []},
+        }
+    }
+    g = SiteGraphFactory().build(env=env, cfg_site_graph=cfg, start_dt=start_dt, rng=rng)
+
+    assert g.get_page("home").forced_next == "b"  # type: ignore
+    assert [g.next_page("home") for _ in range(5)] == ["b"] * 5
+    # no uniform consumed
+    assert rng.random() == RNG(seed=3).random()
+
+
+def test_timestamps_round_once_like_start_plus_timedelta() -> None:
+    import random
+
+    import numpy as np
+
+    from sim.features.persistence.duckdb_adapter import _epoch_s_to_datetime64_us
+
+    env = DummyEnv()
+    start_dt = datetime(2026, 1, 1, tzinfo=UTC)
+    g = SiteGraphFactory().build(env=env, cfg_site_graph={}, start_dt=start_dt, rng=RNG(seed=1))
+
+    r = random.Random(7)
+    epochs, expected = [], []
+    for _ in range(20_000):
+        env.now = r.random() * 30 * 86_400
+        ref = start_dt + timedelta(seconds=env.now)
+        assert g.get_current_time() == ref
+        epochs.append(g.get_current_epoch())
+        expected.append(ref.replace(tzinfo=None))
+
+    # the columnar path turns epoch seconds back into the same microsecond
+    got = _epoch_s_to_datetime64_us(epochs)
+    assert (got == np.array(expected, dtype="datetime64[us]")).all()
@@ -1,16 +1,51 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from bisect import bisect
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from itertools import accumulate
 
 from sim.core.rng import RNG
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Page:
     name: str
     dropoff_p: float
-    transitions: list[tuple[str, float]]
+    transitions: tuple[tuple[str, float], ...]
+
+    # Sampling view of transitions, built once: targets with the cumulative sum of their
+    # normalized weights. Both are empty when there is nothing to transition to.
+    # forced_next is set when exactly one target has positive weight (no draw needed).
+    targets: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    cum_weights: tuple[float, ...] = field(init=False, repr=False, compare=False)
+    forced_next: str | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        total = sum(w for _t, w in self.transitions)
+        if total > 0:
+            targets = tuple(t for t, _w in self.transitions)
+            cum_weights = tuple(accumulate(w / total for _t, w in self.transitions))
+        else:
+            targets, cum_weights = (), ()
+        positive = [t for t, w in self.transitions if w > 0]
+        object.__setattr__(self, "targets", targets)
+        object.__setattr__(self, "cum_weights", cum_weights)
+        object.__setattr__(self, "forced_next", positive[0] if len(positive) == 1 else None)
+
+
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_ONE_US = timedelta(microseconds=1)
+
+
+def _offset_us(seconds: float) -> int:
+    """Whole microseconds in timedelta(seconds=seconds), rounded the same way.
+
+    timedelta splits off the integer seconds and rounds the fraction's microseconds
+    half-to-even; doing the same keeps epoch stamps equal to start_dt + timedelta.
+    """
+    whole = int(seconds)
+    return whole * 1_000_000 + round((seconds - whole) * 1e6)
 
 
 class WebsiteGraph:
@@ -29,6 +64,8 @@ class WebsiteGraph:
         self.env = env
         self.pages = pages or {}
         self.rng = rng
+        # bound once: next_page draws one uniform per call
+        self._random = rng.random
 
         if start_dt.tzinfo is None:
             start_dt = start_dt.replace(tzinfo=UTC)
@@ -36,28 +73,48 @@ class WebsiteGraph:
             start_dt = start_dt.astimezone(UTC)
 
         self.start_dt = start_dt
+        # start as exact integer microseconds, so epoch stamps round only once (in the
+        # sim-time offset), never on start + offset at ~1.7e9 s magnitude
+        self._start_us = (start_dt - _UNIX_EPOCH) // _ONE_US
+
+        # Several events are usually stamped at the same env.now; reuse the last stamp.
+        self._last_now: float | None = None
+        self._last_dt = start_dt
+        self._last_epoch_now: float | None = None
+        self._last_epoch = self._start_us / 1e6
 
     # ----- Authoritative timestamps (UTC) -----
+    def get_current_epoch(self) -> float:
+        """Current sim time as UTC epoch seconds.
+
+        The value is the float nearest to get_current_time()'s exact microsecond, so
+        rounding it back to microseconds recovers that datetime exactly.
+        """
+        now = self.env.now
+        if now != self._last_epoch_now:
+            self._last_epoch = (self._start_us + _offset_us(now)) / 1e6
+            self._last_epoch_now = now
+        return self._last_epoch
+
     def get_current_time(self) -> datetime:
-        return self.start_dt + timedelta(seconds=float(self.env.now))
+        now = self.env.now
+        if now != self._last_now:
+            self._last_dt = self.start_dt + timedelta(seconds=now)
+            self._last_now = now
+        return self._last_dt
 
     # ----- Page helpers -----
     def get_page(self, name: str) -> Page | None:
         return self.pages.get(name)
 
     def next_page(self, current_name: str) -> str | None:
-        page = self.get_page(current_name)
-        if not page or not page.transitions:
-            return None
-
-        names = [t[0] for t in page.transitions]
-        probs = [t[1] for t in page.transitions]
-
-        s = sum(probs)
-        if s <= 0:
+        page = self.pages.get(current_name)
+        if page is None or not page.targets:
             return None
+        if page.forced_next is not None:
+            return page.forced_next
 
-        probs = [p / s for p in probs]
-
-        # critical: use seeded wrapper only
-        return self.rng.choices(names, weights=probs, k=1)[0]
+        # critical: use seeded wrapper only. Same draw and bisect as
+        # rng.choices(targets, cum_weights=cw, k=1)[0], without its per-call setup.
+        cw = page.cum_weights
+        return page.targets[bisect(cw, self._random() * cw[-1], 0, len(cw) - 1)]
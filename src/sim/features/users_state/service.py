@@ -3,10 +3,13 @@ from __future__ import annotations
 from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from math import exp, log
+from math import log, sqrt
+from typing import Any
 
+import numpy as np
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class UsersSelectionConfig:
     mode: str = "recency_propensity_weighted"
     recency_half_life_hours: float = 18.0
@@ -14,14 +17,14 @@ class UsersSelectionConfig:
     recency_weight: float = 0.5
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PropensityInitConfig:
     dist: str = "uniform"  # "uniform" | "beta"
     alpha: float = 2.0
     beta: float = 6.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DiscoveryModeConfig:
     enabled: bool = True
     graduation_sessions: int = 2
@@ -29,7 +32,7 @@ class DiscoveryModeConfig:
     conversion_logit_shift: float = -0.8
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UsersConfig:
     new_user_share: float = 0.6
     selection: UsersSelectionConfig = UsersSelectionConfig()
@@ -37,13 +40,21 @@ class UsersConfig:
     discovery_mode: DiscoveryModeConfig = DiscoveryModeConfig()
 
 
-@dataclass
+@dataclass(slots=True)
 class UserState:
+    """
+    Per-user state handed out by UsersStateService.
+
+    last_seen_ts_utc and propensity are read-only properties: selection reads them
+    from the service's arrays, so the service alone writes the backing slots
+    (mark_session_end / set_last_seen / set_propensity).
+    """
+
     user_id: str
     created_ts_utc: datetime
-    last_seen_ts_utc: datetime
+    _last_seen_ts_utc: datetime
     sessions_count: int
-    propensity: float
+    _propensity: float
     discovery_mode: bool
     discovery_sessions_count: int
 
@@ -51,6 +62,18 @@ class UserState:
     discovery_dropoff_multiplier: float
     discovery_conversion_logit_shift: float
 
+    @property
+    def last_seen_ts_utc(self) -> datetime:
+        return self._last_seen_ts_utc
+
+    @property
+    def propensity(self) -> float:
+        return self._propensity
+
+
+# Beta propensities drawn per NumPy call when the RNG exposes numpy_generator().
+_BETA_BATCH = 1024
+
 
 class UsersStateService:
     """
@@ -66,6 +89,31 @@ class UsersStateService:
         self.users: dict[str, UserState] = {}
         self._next_user_seq: int = 0
 
+        # Session ends queued from SimPy callbacks; applied in order before the next read.
+        self._pending_ends: list[tuple[str, datetime]] = []
+
+        # Beta init: pre-drawn NumPy batch (popped from the end) and the rng it came from;
+        # RNGs without numpy_generator use the polar normal source, which keeps its
+        # spare variate between users.
+        self._beta_buf: list[float] = []
+        self._beta_src: Any = None
+        self._normal: _PolarNormal | None = None
+
+        # Selection hot state as parallel arrays (struct-of-arrays), indexed in creation
+        # order; capacity grows by doubling. Kept in sync by _create_user and
+        # _apply_session_end, so last_seen/propensity changes must go through the service.
+        self._user_list: list[UserState] = []
+        self._user_idx: dict[str, int] = {}
+        self._last_seen_epoch = np.empty(0, dtype=np.float64)
+        self._propensity_score = np.empty(0, dtype=np.float64)
+
+        # Selection constants, fixed for the run. Recency decay uses half-life:
+        # 2 ** (-age_s / half_life_s) => 1 at age=0, 0.5 at age=half_life
+        sel = cfg.selection
+        self._neg_inv_half_life_s = -1.0 / (max(float(sel.recency_half_life_hours), 1e-9) * 3600.0)
+        self._recency_w = float(sel.recency_weight)
+        self._propensity_w = float(sel.propensity_weight)
+
     # ----------------------------
     # Public API
     # ----------------------------
@@ -82,6 +130,8 @@ class UsersStateService:
         - If no users exist, always create.
         - Else: create new w.p. new_user_share, otherwise select existing.
         """
+        if self._pending_ends:
+            self.apply_pending_session_ends()
         now_utc = _ensure_utc(now_utc)
 
         if not self.users:
@@ -104,6 +154,8 @@ class UsersStateService:
         """
         Selects an existing user via configured weighting.
         """
+        if self._pending_ends:
+            self.apply_pending_session_ends()
         now_utc = _ensure_utc(now_utc)
         if not self.users:
             return None
@@ -112,43 +164,102 @@ class UsersStateService:
         if mode != "recency_propensity_weighted":
             raise ValueError(f"Unsupported users.selection.mode={self.cfg.selection.mode!r}")
 
-        candidates = list(self.users.values())
-        weights = [self._weight(u, now_utc=now_utc) for u in candidates]
+        candidates = self._user_list
+        cum_weights = np.cumsum(self._weights(now_utc.timestamp()))
+        total = float(cum_weights[-1])
 
         # If all weights are 0, fall back to uniform.
-        if sum(weights) <= 0:
-            idx = int(rng.random() * len(candidates))
-            return candidates[idx]
+        if not total > 0:
+            randrange = getattr(rng, "randrange", None)
+            if randrange is not None:
+                return candidates[randrange(len(candidates))]
+            return candidates[min(int(rng.random() * len(candidates)), len(candidates) - 1)]
 
-        return rng.choices(candidates, weights=weights, k=1)[0]
+        # Same draw as rng.choices(candidates, weights=w, k=1): cumsum accumulates in the
+        # same order, and a right-side search (clamped to the last index) matches bisect.
+        i = int(np.searchsorted(cum_weights, rng.random() * total, side="right"))
+        return candidates[min(i, len(candidates) - 1)]
 
     def mark_session_end(self, *, user_id: str, now_utc: datetime) -> None:
         """
         Update last_seen + session counters; handle discovery graduation.
         """
+        u = self._require_user(user_id)
+        self._apply_session_end(
+            u, _ensure_utc(now_utc), int(self.cfg.discovery_mode.graduation_sessions)
+        )
+
+    def queue_session_end(self, *, user_id: str, now_utc: datetime) -> None:
+        """
+        Record a session end without touching user state yet.
+        Queued ends are applied in order, in one pass, before any read of user state,
+        so observable state matches calling mark_session_end directly.
+        """
+        self._pending_ends.append((user_id, now_utc))
+
+    def apply_pending_session_ends(self) -> None:
+        pending = self._pending_ends
+        if not pending:
+            return
+        self._pending_ends = []
+
+        users = self.users
+        grad_n = int(self.cfg.discovery_mode.graduation_sessions)
+        apply = self._apply_session_end
+        for user_id, now_utc in pending:
+            u = users.get(user_id)
+            if u is None:
+                raise KeyError(f"Unknown user_id={user_id}")
+            apply(u, _ensure_utc(now_utc), grad_n)
+
+    def set_last_seen(self, *, user_id: str, now_utc: datetime) -> None:
+        """Set a user's last-seen time (no session counted); selection sees it at once."""
+        u = self._require_user(user_id)
         now_utc = _ensure_utc(now_utc)
-        u = self.users.get(user_id)
-        if u is None:
-            raise KeyError(f"Unknown user_id={user_id}")
+        u._last_seen_ts_utc = now_utc
+        self._last_seen_epoch[self._user_idx[user_id]] = now_utc.timestamp()
 
-        u.last_seen_ts_utc = now_utc
-        u.sessions_count += 1
-
-        if u.discovery_mode:
-            u.discovery_sessions_count += 1
-            grad_n = int(self.cfg.discovery_mode.graduation_sessions)
-            if grad_n > 0 and u.discovery_sessions_count >= grad_n:
-                u.discovery_mode = False
+    def set_propensity(self, *, user_id: str, propensity: float) -> None:
+        """Set a user's propensity; selection sees it at once."""
+        u = self._require_user(user_id)
+        u._propensity = float(propensity)
+        self._propensity_score[self._user_idx[user_id]] = max(0.0, min(1.0, u.propensity))
 
     def get_user(self, user_id: str) -> UserState | None:
+        if self._pending_ends:
+            self.apply_pending_session_ends()
         return self.users.get(user_id)
 
+    def num_users(self) -> int:
+        # users are only ever added, so the count needs no pending-ends flush
+        return len(self._user_list)
+
     def all_users(self) -> Iterable[UserState]:
+        if self._pending_ends:
+            self.apply_pending_session_ends()
         return self.users.values()
 
     # ----------------------------
     # Internal helpers
     # ----------------------------
+    def _require_user(self, user_id: str) -> UserState:
+        if self._pending_ends:
+            self.apply_pending_session_ends()
+        u = self.users.get(user_id)
+        if u is None:
+            raise KeyError(f"Unknown user_id={user_id}")
+        return u
+
+    def _apply_session_end(self, u: UserState, now_utc: datetime, grad_n: int) -> None:
+        u._last_seen_ts_utc = now_utc
+        self._last_seen_epoch[self._user_idx[u.user_id]] = now_utc.timestamp()
+        u.sessions_count += 1
+
+        if u.discovery_mode:
+            u.discovery_sessions_count += 1
+            if grad_n > 0 and u.discovery_sessions_count >= grad_n:
+                u.discovery_mode = False
+
     def _create_user(self, *, now_utc: datetime, rng) -> UserState:
         self._next_user_seq += 1
         user_id = f"u_{self._next_user_seq:010d}"
@@ -159,15 +270,25 @@ class UsersStateService:
         u = UserState(
             user_id=user_id,
             created_ts_utc=now_utc,
-            last_seen_ts_utc=now_utc,
+            _last_seen_ts_utc=now_utc,
             sessions_count=0,
-            propensity=float(propensity),
+            _propensity=float(propensity),
             discovery_mode=discovery_enabled,
             discovery_sessions_count=0,
             discovery_dropoff_multiplier=float(self.cfg.discovery_mode.dropoff_multiplier),
             discovery_conversion_logit_shift=float(self.cfg.discovery_mode.conversion_logit_shift),
         )
         self.users[user_id] = u
+
+        n = len(self._user_list)
+        if n == self._last_seen_epoch.size:
+            cap = max(64, 2 * n)
+            self._last_seen_epoch = _grown(self._last_seen_epoch, cap)
+            self._propensity_score = _grown(self._propensity_score, cap)
+        self._last_seen_epoch[n] = now_utc.timestamp()
+        self._propensity_score[n] = max(0.0, min(1.0, u.propensity))
+        self._user_idx[user_id] = n
+        self._user_list.append(u)
         return u
 
     def _init_propensity(self, rng) -> float:
@@ -178,14 +299,26 @@ class UsersStateService:
             return float(rng.random())
 
         if dist == "beta":
-            # We cannot assume numpy; implement Beta via Gamma(a,1)/(Gamma(a,1)+Gamma(b,1))
             a = float(cfg.alpha)
             b = float(cfg.beta)
             if a <= 0 or b <= 0:
                 # fall back to uniform if misconfigured
                 return float(rng.random())
-            x = _gamma_sample(shape=a, rng=rng)
-            y = _gamma_sample(shape=b, rng=rng)
+
+            numpy_generator = getattr(rng, "numpy_generator", None)
+            if numpy_generator is not None:
+                buf = self._beta_buf
+                if not buf or self._beta_src is not rng:
+                    self._beta_src = rng
+                    buf = self._beta_buf = numpy_generator().beta(a, b, _BETA_BATCH).tolist()
+                return buf.pop()
+
+            # No numpy generator: Beta via Gamma(a,1)/(Gamma(a,1)+Gamma(b,1))
+            normal = self._normal
+            if normal is None or normal.rng is not rng:
+                normal = self._normal = _PolarNormal(rng)
+            x = _gamma_sample(shape=a, rng=rng, normal=normal)
+            y = _gamma_sample(shape=b, rng=rng, normal=normal)
             if x + y <= 0:
                 return float(rng.random())
             return float(x / (x + y))
@@ -193,66 +326,88 @@ class UsersStateService:
         # Unknown dist -> uniform
         return float(rng.random())
 
-    def _weight(self, u: UserState, *, now_utc: datetime) -> float:
-        sel = self.cfg.selection
+    def _weights(self, now_epoch: float) -> np.ndarray:
+        """Selection weight of every user (creation order), computed in one vector pass."""
+        n = len(self._user_list)
+        age_s = np.maximum(now_epoch - self._last_seen_epoch[:n], 0.0)
+        w = np.exp2(age_s * self._neg_inv_half_life_s)
+        w *= self._recency_w
+        w += self._propensity_w * self._propensity_score[:n]
+        return np.maximum(w, 0.0, out=w)
 
-        # Recency decay using half-life
-        half_life_h = max(float(sel.recency_half_life_hours), 1e-9)
-        age_s = max(0.0, (now_utc - u.last_seen_ts_utc).total_seconds())
-        age_h = age_s / 3600.0
 
-        # exp(-ln2 * age/half_life) => 1 at age=0, 0.5 at age=half_life
-        recency_score = exp(-log(2.0) * (age_h / half_life_h))
-
-        propensity_score = max(0.0, min(1.0, float(u.propensity)))
-
-        w = (
-            float(sel.recency_weight) * recency_score
-            + float(sel.propensity_weight) * propensity_score
-        )
-        return max(0.0, w)
+def _grown(arr: np.ndarray, capacity: int) -> np.ndarray:
+    out = np.empty(capacity, dtype=arr.dtype)
+    out[: arr.size] = arr
+    return out
 
 
 def _ensure_utc(dt: datetime) -> datetime:
+    # datetime.UTC is a singleton: the common already-UTC case returns without a call
+    if dt.tzinfo is UTC:
+        return dt
     if dt.tzinfo is None:
         return dt.replace(tzinfo=UTC)
     return dt.astimezone(UTC)
 
 
-def _gamma_sample(*, shape: float, rng) -> float:
+def _gamma_sample(*, shape: float, rng, normal: _PolarNormal | None = None) -> float:
     """
     Marsaglia and Tsang method for Gamma(shape, 1).
     shape > 0. No numpy dependency.
     """
+    if normal is None:
+        normal = _PolarNormal(rng)
+
     # Special-case small shapes using boosting: Gamma(k) = Gamma(k+1) * U^(1/k)
     if shape < 1.0:
         u = rng.random()
-        return _gamma_sample(shape=shape + 1.0, rng=rng) * (u ** (1.0 / shape))
+        return _gamma_sample(shape=shape + 1.0, rng=rng, normal=normal) * (u ** (1.0 / shape))
 
     d = shape - 1.0 / 3.0
-    c = 1.0 / (3.0 * d) ** 0.5
+    c = 1.0 / (9.0 * d) ** 0.5
+    random = rng.random
 
     while True:
-        x = _std_normal(rng)
+        x = normal()
         v = 1.0 + c * x
         if v <= 0:
             continue
         v = v**3
-        u = rng.random()
+        u = random()
         if u < 1.0 - 0.0331 * (x**4):
             return d * v
         if log(u) < 0.5 * x * x + d * (1.0 - v + log(v)):
             return d * v
 
 
-def _std_normal(rng) -> float:
+class _PolarNormal:
     """
-    Box-Muller transform using rng.random().
+    Standard normals from rng.random() via the Marsaglia polar method.
+    Each accepted point yields two independent variates; the second is
+    returned by the next call, so there is no trig and one log per pair.
     """
-    # Avoid log(0)
-    u1 = max(rng.random(), 1e-12)
-    u2 = rng.random()
-    from math import cos, pi, sqrt
-    from math import log as mlog
 
-    return sqrt(-2.0 * mlog(u1)) * cos(2.0 * pi * u2)
+    __slots__ = ("_random", "_spare", "rng")
+
+    def __init__(self, rng: Any) -> None:
+        self.rng = rng
+        self._random = rng.random
+        self._spare: float | None = None
+
+    def __call__(self) -> float:
+        spare = self._spare
+        if spare is not None:
+            self._spare = None
+            return spare
+
+        random = self._random
+        while True:
+            u = 2.0 * random() - 1.0
+            v = 2.0 * random() - 1.0
+            s = u * u + v * v
+            if 0.0 < s < 1.0:
+                break
+        f = sqrt(-2.0 * log(s) / s)
+        self._spare = v * f
+        return u * f
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import math
+from bisect import bisect
 from datetime import UTC, datetime, timedelta
+from itertools import accumulate
+
+import pytest
 
 from sim.features.users_state.service import (
     DiscoveryModeConfig,
@@ -29,18 +34,14 @@ class DummyRNG:
 
     def choices(self, population, weights, k=1):
         assert k == 1
-        total = sum(weights)
+        cum = list(accumulate(weights))
+        total = cum[-1] if cum else 0.0
         if total <= 0:
             # uniform fallback
             idx = int(self.random() * len(population))
             return [population[idx]]
-        r = self.random() * total
-        c = 0.0
-        for item, w in zip(population, weights, strict=False):
-            c += w
-            if r <= c:
-                return [item]
-        return [population[-1]]
+        # same bisect over the prefix sum as random.choices and select_existing_user
+        return [population[bisect(cum, self.random() * total, 0, len(cum) - 1)]]
 
 
 UTC = UTC
@@ -72,7 +73,8 @@ def test_new_user_share_one_always_creates():
 
     assert n1 is True and n2 is True
     assert u1.user_id != u2.user_id
-    assert len(list(svc.all_users())) == 2
+    assert svc.num_users() == 2
+    assert [u.user_id for u in svc.all_users()] == [u1.user_id, u2.user_id]
 
 
 def test_new_user_share_zero_selects_existing_when_available():
@@ -89,7 +91,7 @@ def test_new_user_share_zero_selects_existing_when_available():
     assert n1 is True
     assert n2 is False
     assert u2.user_id == u1.user_id
-    assert len(list(svc.all_users())) == 1
+    assert svc.num_users() == 1
 
 
 def test_recency_weighting_prefers_recent_user():
@@ -115,8 +117,8 @@ def test_recency_weighting_prefers_recent_user():
     assert u_old.user_id != u_new.user_id
 
     # Make u_old stale by 4 hours; keep u_new fresh
-    svc.get_user(u_old.user_id).last_seen_ts_utc = t0 - timedelta(hours=4)
-    svc.get_user(u_new.user_id).last_seen_ts_utc = t0
+    svc.set_last_seen(user_id=u_old.user_id, now_utc=t0 - timedelta(hours=4))
+    svc.set_last_seen(user_id=u_new.user_id, now_utc=t0)
 
     picks = {u_old.user_id: 0, u_new.user_id: 0}
     for _ in range(200):
@@ -145,3 +147,203 @@ def test_discovery_graduation_after_n_sessions():
 
     svc.mark_session_end(user_id=u.user_id, now_utc=now + timedelta(minutes=20))
     assert svc.get_user(u.user_id).discovery_mode is False
+
+
+def test_queued_session_ends_apply_before_next_read():
+    cfg = UsersConfig(
+        new_user_share=1.0,
+        discovery_mode=DiscoveryModeConfig(enabled=True, graduation_sessions=2),
+    )
+    svc = UsersStateService(cfg)
+    rng = DummyRNG([0.7, 0.7, 0.7])
+
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+    u, _ = svc.get_or_create_user_for_intent(now_utc=now, rng=rng)
+
+    svc.queue_session_end(user_id=u.user_id, now_utc=now + timedelta(minutes=10))
+    svc.queue_session_end(user_id=u.user_id, now_utc=now + timedelta(minutes=20))
+    # nothing applied until state is read
+    assert u.sessions_count == 0
+
+    got = svc.get_user(u.user_id)
+    assert got.sessions_count == 2
+    assert got.last_seen_ts_utc == now + timedelta(minutes=20)
+    assert got.discovery_mode is False
+
+
+def test_polar_normal_returns_cached_spare_from_one_rng_pair():
+    from sim.features.users_state.service import _PolarNormal
+
+    # (0.75, 0.5) -> u=0.5, v=0.0 -> s=0.25: one accepted pair, two variates
+    rng = DummyRNG([0.75, 0.5])
+    normal = _PolarNormal(rng)
+
+    first = normal()
+    second = normal()
+
+    assert rng.i == 2
+    assert abs(first - 0.5 * (-2.0 * math.log(0.25) / 0.25) ** 0.5) < 1e-12
+    assert second == 0.0
+
+
+def test_beta_init_propensity_is_in_unit_interval():
+    import random
+
+    cfg = UsersConfig(
+        new_user_share=1.0,
+        propensity_init=PropensityInitConfig(dist="beta", alpha=2.0, beta=6.0),
+    )
+    svc = UsersStateService(cfg)
+    rng = random.Random(5)
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+
+    props = [
+        svc.get_or_create_user_for_intent(now_utc=now, rng=rng)[0].propensity for _ in range(500)
+    ]
+
+    assert all(0.0 < p < 1.0 for p in props)
+    # Beta(2, 6) has mean 0.25
+    assert abs(sum(props) / len(props) - 0.25) < 0.03
+
+
+def test_vector_weights_match_scalar_formula():
+    cfg = UsersConfig(
+        new_user_share=1.0,
+        selection=UsersSelectionConfig(
+            recency_half_life_hours=2.0, recency_weight=0.7, propensity_weight=0.3
+        ),
+    )
+    svc = UsersStateService(cfg)
+    rng = DummyRNG([0.1, 0.4, 0.9])
+    t0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+    users = [svc.get_or_create_user_for_intent(now_utc=t0, rng=rng)[0] for _ in range(100)]
+    for i, u in enumerate(users):
+        svc.mark_session_end(user_id=u.user_id, now_utc=t0 + timedelta(minutes=i))
+
+    now = t0 + timedelta(hours=3)
+    expected = [
+        0.7 * math.exp(-math.log(2.0) * ((now - u.last_seen_ts_utc).total_seconds() / 3600 / 2.0))
+        + 0.3 * u.propensity
+        for u in users
+    ]
+    got = svc._weights(now.timestamp()).tolist()
+
+    assert len(got) == len(expected)
+    assert all(abs(g - e) < 1e-12 for g, e in zip(got, expected, strict=True))
+
+
+def test_beta_init_uses_numpy_batches_when_available():
+    from sim.core.rng import RNG
+
+    cfg = UsersConfig(
+        new_user_share=1.0,
+        propensity_init=PropensityInitConfig(dist="beta", alpha=2.0, beta=6.0),
+    )
+    svc = UsersStateService(cfg)
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+
+    rng = RNG(seed=11)
+    first = svc.get_or_create_user_for_intent(now_utc=now, rng=rng)[0].propensity
+
+    expected = RNG(seed=11).numpy_generator().beta(2.0, 6.0, 1024)[-1]
+    assert first == expected
+
+
+def test_gamma_sample_matches_gamma_moments():
+    import random
+
+    from sim.features.users_state.service import _gamma_sample
+
+    rng = random.Random(3)
+    draws = [_gamma_sample(shape=2.0, rng=rng) for _ in range(50_000)]
+    mean = sum(draws) / len(draws)
+    var = sum((x - mean) ** 2 for x in draws) / (len(draws) - 1)
+
+    # Gamma(2, 1): mean 2, variance 2
+    assert abs(mean - 2.0) < 0.03
+    assert abs(var - 2.0) < 0.08
+
+
+@pytest.mark.parametrize("numpy_path", [True, False])
+def test_beta_init_moments_match_on_both_paths(numpy_path):
+    import random
+
+    from sim.core.rng import RNG
+
+    cfg = UsersConfig(
+        new_user_share=1.0,
+        propensity_init=PropensityInitConfig(dist="beta", alpha=2.0, beta=6.0),
+    )
+    svc = UsersStateService(cfg)
+    # random.Random has no numpy_generator, so it takes the Marsaglia-Tsang fallback
+    rng = RNG(seed=4) if numpy_path else random.Random(4)
+    props = [svc._init_propensity(rng) for _ in range(40_000)]
+    mean = sum(props) / len(props)
+    var = sum((p - mean) ** 2 for p in props) / (len(props) - 1)
+
+    # Beta(2, 6): mean 0.25, variance 12 / (64 * 9)
+    assert abs(mean - 0.25) < 0.004
+    assert abs(var - 12.0 / 576.0) < 0.0008
+
+
+@pytest.mark.parametrize("n_users", [1, 10, 1000])
+def test_selection_matches_random_choices_over_scalar_weights(n_users):
+    import random
+
+    cfg = UsersConfig(
+        new_user_share=1.0,
+        selection=UsersSelectionConfig(
+            recency_half_life_hours=6.0, recency_weight=0.5, propensity_weight=0.5
+        ),
+    )
+    svc = UsersStateService(cfg)
+    t0 = datetime(2026, 1, 1, tzinfo=UTC)
+    setup_rng = random.Random(1)
+    users = [
+        svc.get_or_create_user_for_intent(now_utc=t0, rng=setup_rng)[0] for _ in range(n_users)
+    ]
+    for i, u in enumerate(users):
+        svc.mark_session_end(user_id=u.user_id, now_utc=t0 + timedelta(minutes=7 * i))
+
+    # some users are last seen after `now`: their age clamps to 0
+    now = t0 + timedelta(days=2)
+    weights = [
+        0.5 * 2.0 ** (-max(0.0, (now - u.last_seen_ts_utc).total_seconds()) / (6.0 * 3600.0))
+        + 0.5 * u.propensity
+        for u in users
+    ]
+
+    got_rng, ref_rng = random.Random(9), random.Random(9)
+    for _ in range(300):
+        got = svc.select_existing_user(now_utc=now, rng=got_rng)
+        assert got is ref_rng.choices(users, weights=weights, k=1)[0]
+
+
+def test_selection_fields_are_read_only_and_set_through_the_service():
+    cfg = UsersConfig(
+        new_user_share=1.0,
+        selection=UsersSelectionConfig(recency_weight=0.0, propensity_weight=1.0),
+        propensity_init=PropensityInitConfig(dist="uniform"),
+    )
+    svc = UsersStateService(cfg)
+    rng = DummyRNG([0.5])
+    t0 = datetime(2026, 1, 1, tzinfo=UTC)
+    u_a, _ = svc.get_or_create_user_for_intent(now_utc=t0, rng=rng)
+    u_b, _ = svc.get_or_create_user_for_intent(now_utc=t0, rng=rng)
+
+    with pytest.raises(AttributeError):
+        u_a.last_seen_ts_utc = t0 - timedelta(hours=1)
+    with pytest.raises(AttributeError):
+        u_a.propensity = 0.0
+    # other fields stay writable
+    u_a.sessions_count = 5
+
+    # the service setters update both the object and what selection reads
+    svc.set_propensity(user_id=u_a.user_id, propensity=0.0)
+    assert u_a.propensity == 0.0
+    picks = {svc.select_existing_user(now_utc=t0, rng=rng).user_id for _ in range(20)}
+    assert picks == {u_b.user_id}
+
+    svc.set_last_seen(user_id=u_b.user_id, now_utc=t0 + timedelta(minutes=5))
+    assert u_b.last_seen_ts_utc == t0 + timedelta(minutes=5)